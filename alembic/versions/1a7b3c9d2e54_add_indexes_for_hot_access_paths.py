@@ -0,0 +1,122 @@
+"""Add indexes for hot access paths
+
+Revision ID: 1a7b3c9d2e54
+Revises: 8c41d7e2b3f0
+Create Date: 2026-10-17 12:41:08.215734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "1a7b3c9d2e54"
+down_revision: Union[str, None] = "8c41d7e2b3f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Collapse duplicate enrollments onto the oldest row (moving their marks)
+    # and duplicate teacher assignments, so the unique indexes can be built.
+    op.execute(sa.text("""
+        UPDATE marks SET enrollment_id = (
+            SELECT MIN(dup.id)
+            FROM student_enrollments dup
+            JOIN student_enrollments e
+              ON e.cohort_id = dup.cohort_id
+             AND e.student_user_id = dup.student_user_id
+            WHERE e.id = marks.enrollment_id
+        )
+        """))
+    op.execute(sa.text("""
+        DELETE FROM student_enrollments WHERE id NOT IN (
+            SELECT MIN(id) FROM student_enrollments
+            GROUP BY cohort_id, student_user_id
+        )
+        """))
+    op.execute(sa.text("""
+        DELETE FROM cohort_teachers WHERE id NOT IN (
+            SELECT MIN(id) FROM cohort_teachers
+            GROUP BY cohort_id, teacher_user_id
+        )
+        """))
+
+    op.create_index(
+        "uq_student_enrollments_cohort_id_student_user_id",
+        "student_enrollments",
+        ["cohort_id", "student_user_id"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_student_enrollments_student_user_id",
+        "student_enrollments",
+        ["student_user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "uq_cohort_teachers_cohort_id_teacher_user_id",
+        "cohort_teachers",
+        ["cohort_id", "teacher_user_id"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_enrollment_cohorts_lab_id_section",
+        "enrollment_cohorts",
+        ["lab_id", "section"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_projects_cohort_id_submission_date",
+        "projects",
+        ["cohort_id", "submission_date"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_projects_student_user_id", "projects", ["student_user_id"], unique=False
+    )
+    op.create_index(
+        "ix_project_stars_project_id_user_id",
+        "project_stars",
+        ["project_id", "user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_project_stars_starred_at", "project_stars", ["starred_at"], unique=False
+    )
+    op.create_index(
+        "ix_marks_enrollment_id_date_recorded",
+        "marks",
+        ["enrollment_id", "date_recorded"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_teacher_profiles_lab_id"),
+        "teacher_profiles",
+        ["lab_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_teacher_profiles_lab_id"), table_name="teacher_profiles")
+    op.drop_index("ix_marks_enrollment_id_date_recorded", table_name="marks")
+    op.drop_index("ix_project_stars_starred_at", table_name="project_stars")
+    op.drop_index("ix_project_stars_project_id_user_id", table_name="project_stars")
+    op.drop_index("ix_projects_student_user_id", table_name="projects")
+    op.drop_index("ix_projects_cohort_id_submission_date", table_name="projects")
+    op.drop_index(
+        "ix_enrollment_cohorts_lab_id_section", table_name="enrollment_cohorts"
+    )
+    op.drop_index(
+        "uq_cohort_teachers_cohort_id_teacher_user_id", table_name="cohort_teachers"
+    )
+    op.drop_index(
+        "ix_student_enrollments_student_user_id", table_name="student_enrollments"
+    )
+    op.drop_index(
+        "uq_student_enrollments_cohort_id_student_user_id",
+        table_name="student_enrollments",
+    )
@@ -0,0 +1,38 @@
+"""Add star_count to projects
+
+Revision ID: 4d6e8f0a1b23
+Revises: 1a7b3c9d2e54
+Create Date: 2026-10-17 14:02:51.603118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4d6e8f0a1b23"
+down_revision: Union[str, None] = "1a7b3c9d2e54"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "projects",
+        sa.Column("star_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    # Backfill from the existing stars
+    op.execute(sa.text("""
+        UPDATE projects SET star_count = (
+            SELECT COUNT(*) FROM project_stars
+            WHERE project_stars.project_id = projects.id
+        )
+        """))
+    op.create_index("ix_projects_star_count", "projects", ["star_count"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_projects_star_count", table_name="projects")
+    op.drop_column("projects", "star_count")
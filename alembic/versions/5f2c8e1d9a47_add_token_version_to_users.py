@@ -0,0 +1,29 @@
+"""Add token_version to users
+
+Revision ID: 5f2c8e1d9a47
+Revises: ae10fa20eac5
+Create Date: 2026-10-17 09:12:44.318205
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2c8e1d9a47"
+down_revision: Union[str, None] = "ae10fa20eac5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
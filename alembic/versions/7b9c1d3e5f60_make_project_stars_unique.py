@@ -0,0 +1,50 @@
+"""Make project stars unique per user
+
+Revision ID: 7b9c1d3e5f60
+Revises: 4d6e8f0a1b23
+Create Date: 2026-10-17 15:20:37.482960
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7b9c1d3e5f60"
+down_revision: Union[str, None] = "4d6e8f0a1b23"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Drop duplicate stars (keeping the oldest) and recount the affected projects.
+    op.execute(sa.text("""
+        DELETE FROM project_stars WHERE id NOT IN (
+            SELECT MIN(id) FROM project_stars GROUP BY project_id, user_id
+        )
+        """))
+    op.execute(sa.text("""
+        UPDATE projects SET star_count = (
+            SELECT COUNT(*) FROM project_stars
+            WHERE project_stars.project_id = projects.id
+        )
+        """))
+    op.drop_index("ix_project_stars_project_id_user_id", table_name="project_stars")
+    op.create_index(
+        "uq_project_stars_project_id_user_id",
+        "project_stars",
+        ["project_id", "user_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_project_stars_project_id_user_id", table_name="project_stars")
+    op.create_index(
+        "ix_project_stars_project_id_user_id",
+        "project_stars",
+        ["project_id", "user_id"],
+        unique=False,
+    )
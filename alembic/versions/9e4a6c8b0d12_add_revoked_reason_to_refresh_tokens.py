@@ -0,0 +1,29 @@
+"""Add revoked_reason to refresh_tokens
+
+Revision ID: 9e4a6c8b0d12
+Revises: 7b9c1d3e5f60
+Create Date: 2026-10-17 18:42:05.113204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4a6c8b0d12"
+down_revision: Union[str, None] = "7b9c1d3e5f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "refresh_tokens",
+        sa.Column("revoked_reason", sa.String(length=16), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("refresh_tokens", "revoked_reason")
@@ -1,11 +1,20 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
-from typing import List
+from pydantic import ValidationError
+from typing import AsyncIterator, List
 
-from app.db.session import SessionLocal
+from app.db.session import (
+    SessionLocal,
+    AsyncSessionLocal,
+    ReplicaSessionLocal,
+    AsyncReplicaSessionLocal,
+)
+from app.db.routing import recent_writers
 from app.core.security import decode_access_token
+from app.core.user_cache import CurrentUser, user_cache
 from app.services import user_service
 from app.models.user import User, UserRole
 from app.schemas.auth import TokenData
@@ -23,12 +32,26 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency to get an async database session for async endpoints."""
+    if AsyncSessionLocal is None:
+        raise RuntimeError(
+            "No async database driver is available; set ASYNC_DATABASE_URL."
+        )
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+) -> CurrentUser:
     """
     Dependency to get the current user from a JWT token.
     This performs AUTHENTICATION (verifying who the user is).
+    The user is built from the token claims; the only DB work is checking the
+    token version, and that result is cached for USER_CACHE_TTL_SECONDS. Revoked
+    tokens are rejected at once by the worker that revoked them and within that
+    TTL by every other worker. Use get_current_db_user when the full row is needed.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,16 +62,91 @@ def get_current_user(
         payload = decode_access_token(token)
         if payload is None:
             raise credentials_exception
-        mobile_number: str = payload.get("sub")
-        if mobile_number is None:
+        token_data = TokenData(
+            mobile_number=payload.get("sub"),
+            user_id=payload.get("uid"),
+            role=payload.get("role"),
+            lab_id=payload.get("lab_id"),
+            token_version=payload.get("ver"),
+        )
+    except (JWTError, ValidationError):
+        raise credentials_exception
+    if (
+        token_data.mobile_number is None
+        or token_data.user_id is None
+        or token_data.role is None
+        or token_data.token_version is None
+    ):
+        raise credentials_exception
+
+    cached_user = user_cache.get(token_data.mobile_number)
+    if cached_user is None:
+        # Revocation check: the token is only valid for the user's current version
+        token_version = user_service.get_token_version(db, user_id=token_data.user_id)
+        if token_version is None:
             raise credentials_exception
-        token_data = TokenData(mobile_number=mobile_number)
-    except JWTError:
+        cached_user = CurrentUser(
+            id=token_data.user_id,
+            role=token_data.role,
+            mobile_number=token_data.mobile_number,
+            lab_id=token_data.lab_id,
+            token_version=token_version,
+        )
+        user_cache.set(token_data.mobile_number, cached_user)
+
+    if (
+        cached_user.id != token_data.user_id
+        or cached_user.token_version != token_data.token_version
+    ):
         raise credentials_exception
+    # Lets commits on this session be attributed to the user (read-your-writes)
+    db.info["user_id"] = cached_user.id
+    return cached_user
+
+
+def get_read_db(current_user: CurrentUser = Depends(get_current_user)):
+    """
+    Dependency to get a database session for read-only routes.
+    Uses the read replica when one is configured, except for users who
+    committed a write within the last READ_YOUR_WRITES_SECONDS.
+    """
+    if ReplicaSessionLocal is None or recent_writers.is_recent(current_user.id):
+        session_factory = SessionLocal
+    else:
+        session_factory = ReplicaSessionLocal
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    current_user: CurrentUser = Depends(get_current_user),
+) -> AsyncIterator[AsyncSession]:
+    """Async counterpart of get_read_db for async endpoints."""
+    if AsyncReplicaSessionLocal is None or recent_writers.is_recent(current_user.id):
+        async for db in get_async_db():
+            yield db
+        return
+    async with AsyncReplicaSessionLocal() as db:
+        yield db
+
 
-    user = user_service.get_user_by_mobile(db, mobile_number=token_data.mobile_number)
+def get_current_db_user(
+    db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)
+) -> User:
+    """
+    Dependency to load the full User row of the authenticated user.
+    Only needed by endpoints that read or modify the user's own record.
+    """
+    user = user_service.get_user_by_id(db, user_id=current_user.id)
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
@@ -61,7 +159,7 @@ class RoleChecker:
     def __init__(self, allowed_roles: List[UserRole]):
         self.allowed_roles = allowed_roles
 
-    def __call__(self, current_user: User = Depends(get_current_user)):
+    def __call__(self, current_user: CurrentUser = Depends(get_current_user)):
         if current_user.role not in self.allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -13,6 +13,7 @@ from app.api.v1.endpoints import (
     user,
     dashboard_admin,
     leaderboard,
+    metrics,
 )
 
 api_router = APIRouter()
@@ -43,3 +44,6 @@ api_router.include_router(
 )
 api_router.include_router(project.router, prefix="/projects", tags=["Projects"])
 api_router.include_router(mark.router, prefix="/marks", tags=["Marks"])
+
+# Operations
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
@@ -1,13 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app.schemas.auth import Token, UserLogin
+from app.schemas.auth import Token, UserLogin, RefreshTokenRequest
 from app.schemas.user import UserCreate, User as UserSchema
-from app.services import user_service
-from app.core.security import create_access_token, verify_password
+from app.services import user_service, refresh_token_service
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    verify_password_async,
+)
 from app.api.dependencies import get_db, RoleChecker  # Import RoleChecker
-from app.models.user import User, UserRole  # Import User and UserRole
+from app.core.user_cache import CurrentUser
+from app.models.user import UserRole
 
 router = APIRouter()
 
@@ -16,7 +22,7 @@ admin_permission = RoleChecker([UserRole.admin])
 
 
 @router.post("/login/token", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     # db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
     login_data: UserLogin,  # This correctly expects a JSON body matching the UserLogin schema
     db: Session = Depends(get_db),
@@ -24,25 +30,65 @@ def login_for_access_token(
     """
     Authenticate user and return a JWT token.
     Accepts a JSON body.
+    The bcrypt check runs on the dedicated hashing executor; if its queue is full
+    the request is rejected with 503 instead of tying up a request thread.
     """
-    user = user_service.get_user_by_mobile(db, mobile_number=login_data.mobile_number)
-    if not user or not verify_password(login_data.password, user.password_hash):
+    user = await run_in_threadpool(
+        user_service.get_user_by_mobile, db, mobile_number=login_data.mobile_number
+    )
+    if not user or not await verify_password_async(
+        login_data.password, user.password_hash
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect mobile number or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(
-        data={"sub": user.mobile_number, "role": user.role.value}
+    claims = await run_in_threadpool(user_service.get_token_claims, user)
+    access_token = create_access_token(data=claims)
+    refresh_token = await run_in_threadpool(
+        refresh_token_service.create_refresh_token, db, user_id=user.id
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+@router.post("/login/refresh", response_model=Token)
+def refresh_access_token(data: RefreshTokenRequest, db: Session = Depends(get_db)):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+    The presented refresh token is single-use. No password hashing is involved.
+    """
+    result = refresh_token_service.rotate_refresh_token(db, token=data.refresh_token)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    claims, refresh_token = result
+    return {
+        "access_token": create_access_token(data=claims),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+@router.post("/logout")
+def logout(data: RefreshTokenRequest, db: Session = Depends(get_db)):
+    """Revoke a refresh token so it can no longer be exchanged."""
+    refresh_token_service.revoke_refresh_token(db, token=data.refresh_token)
+    return {"message": "Logged out successfully"}
 
 
 @router.post("/users/", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def create_new_user(
+async def create_new_user(
     user: UserCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),  # This protects the route
+    current_user: CurrentUser = Depends(admin_permission),  # This protects the route
 ):
     """
     Create a new user. This endpoint is now protected and can only be
@@ -50,10 +96,15 @@ def create_new_user(
 
     This is how you will create Lab Heads, other Admins, etc.
     """
-    db_user = user_service.get_user_by_mobile(db, mobile_number=user.mobile_number)
+    db_user = await run_in_threadpool(
+        user_service.get_user_by_mobile, db, mobile_number=user.mobile_number
+    )
     if db_user:
         raise HTTPException(status_code=400, detail="Mobile number already registered")
 
     # You could add more logic here, e.g., an admin can't create a student directly
 
-    return user_service.create_user(db=db, user=user)
+    hashed_password = await get_password_hash_async(user.password)
+    return await run_in_threadpool(
+        user_service.create_user, db=db, user=user, hashed_password=hashed_password
+    )
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import new schemas and services
 from app.schemas.dashboard import LabDashboardStats
@@ -12,8 +13,9 @@ from app.services import (
 )
 
 # Import new dependencies
-from app.api.dependencies import get_db, RoleChecker
-from app.models.user import User, UserRole
+from app.api.dependencies import get_read_db, get_async_read_db, RoleChecker
+from app.core.user_cache import CurrentUser
+from app.models.user import UserRole
 
 router = APIRouter()
 
@@ -31,22 +33,34 @@ any_user_permission = RoleChecker(
 
 
 @router.get("/lab/{lab_id}/", response_model=LabDashboardStats)
-def read_lab_dashboard(
+async def read_lab_dashboard(
     lab_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(any_user_permission),
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(any_user_permission),
 ):
     """
     Retrieve dashboard statistics for a specific lab.
+    The latency of each section (or a cache hit) is reported in the Server-Timing header.
     """
     # Note: Add permission check here if not all users should see all lab dashboards
-    stats = dashboard_service.get_lab_dashboard_stats(db=db, lab_id=lab_id)
+    timings = {}
+    stats = await dashboard_service.get_lab_dashboard_stats_async(
+        db=db, lab_id=lab_id, timings=timings
+    )
+    response.headers["Server-Timing"] = (
+        ", ".join(
+            f"{name};dur={elapsed_ms:.1f}" for name, elapsed_ms in timings.items()
+        )
+        or 'cache;desc="hit"'
+    )
     return stats
 
 
 @router.get("/me/", response_model=StudentDashboardStats)
 def read_student_dashboard(
-    db: Session = Depends(get_db), current_user: User = Depends(student_permission)
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(student_permission),
 ):
     """
     Retrieve personalized dashboard statistics for the currently authenticated student.
@@ -58,9 +72,9 @@ def read_student_dashboard(
 
 
 @router.get("/projects/", response_model=ProjectDashboardStats)
-def read_project_dashboard(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(
+async def read_project_dashboard(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(
         any_user_permission
     ),  # Any authenticated user can see this
 ):
@@ -68,4 +82,4 @@ def read_project_dashboard(
     Retrieve global project dashboard statistics (top-rated and recent).
     - **Permissions**: any authenticated user
     """
-    return dashboard_project_service.get_project_dashboard_stats(db=db)
+    return await dashboard_project_service.get_project_dashboard_stats_async(db=db)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.services import dashboard_admin_service
-from app.api.dependencies import get_db, RoleChecker
+from app.api.dependencies import get_read_db, RoleChecker
 from app.models.user import UserRole
 
 router = APIRouter()
@@ -12,7 +12,7 @@ admin_permission = RoleChecker([UserRole.admin, UserRole.sub_admin])
 
 @router.get("/")
 def read_admin_dashboard_stats(
-    db: Session = Depends(get_db), current_user=Depends(admin_permission)
+    db: Session = Depends(get_read_db), current_user=Depends(admin_permission)
 ):
     """
     Retrieve aggregated statistics for the admin dashboard.
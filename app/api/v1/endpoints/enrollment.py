@@ -6,23 +6,28 @@ from app.schemas.enrollment import (
     EnrollmentCohort as EnrollmentCohortSchema,
     EnrollmentCohortCreate,
     StudentEnrollmentCreate,
+    BulkEnrollmentCreate,
+    BulkEnrollmentResult,
+    CohortRosterUpdate,
+    RosterSyncResult,
     EnrollmentCohortUpdate,
     StudentEnrollmentDetails,
     TeacherAssignmentDetails,
 )
 from app.services import enrollment_service
 from app.api.dependencies import get_db, get_current_user
-from app.models.user import User, UserRole
+from app.core.user_cache import CurrentUser
+from app.models.user import UserRole
 from app.models.enrollment import EnrollmentCohort, StudentEnrollment
 
 router = APIRouter()
 
 
-def check_lab_permission(current_user: User, lab_id: int):
+def check_lab_permission(current_user: CurrentUser, lab_id: int):
     """Helper to verify if a user has permission for a lab."""
     if current_user.role in [UserRole.admin, UserRole.sub_admin]:
         return True
-    if current_user.teacher_profile and current_user.teacher_profile.lab_id == lab_id:
+    if current_user.lab_id is not None and current_user.lab_id == lab_id:
         return True
     return False
 
@@ -36,7 +41,7 @@ def create_enrollment_cohort(
     lab_id: int,
     cohort: EnrollmentCohortCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     if not check_lab_permission(current_user, lab_id):
         raise HTTPException(status_code=403, detail="Not authorized to manage this lab")
@@ -49,7 +54,7 @@ def create_enrollment_cohort(
 def read_cohorts_in_lab(
     lab_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     if not check_lab_permission(current_user, lab_id):
         raise HTTPException(
@@ -63,7 +68,7 @@ def update_a_cohort(
     cohort_id: int,
     cohort_data: EnrollmentCohortUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Update a cohort's details.
@@ -86,7 +91,7 @@ def enroll_students(
     cohort_id: int,
     enrollment_data: StudentEnrollmentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     cohort = db.query(EnrollmentCohort).filter(EnrollmentCohort.id == cohort_id).first()
     if not cohort:
@@ -106,9 +111,81 @@ def enroll_students(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post(
+    "/bulk/",
+    response_model=BulkEnrollmentResult,
+    status_code=status.HTTP_201_CREATED,
+)
+def bulk_enroll_students(
+    enrollment_data: BulkEnrollmentCreate,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Enrolls students into several cohorts in one transaction. Students that are
+    already enrolled are skipped and reported in `already_enrolled`.
+    """
+    enrollments = {}
+    for batch in enrollment_data.enrollments:
+        enrollments.setdefault(batch.cohort_id, []).extend(batch.student_user_ids)
+    if not enrollments:
+        raise HTTPException(status_code=400, detail="No enrollments given.")
+
+    cohort_labs = dict(
+        db.query(EnrollmentCohort.id, EnrollmentCohort.lab_id).filter(
+            EnrollmentCohort.id.in_(enrollments)
+        )
+    )
+    missing_ids = set(enrollments) - set(cohort_labs)
+    if missing_ids:
+        raise HTTPException(
+            status_code=404, detail=f"Cohorts with ids {missing_ids} not found."
+        )
+    if not all(
+        check_lab_permission(current_user, lab_id)
+        for lab_id in set(cohort_labs.values())
+    ):
+        raise HTTPException(
+            status_code=403, detail="Not authorized to enroll students in these cohorts"
+        )
+    try:
+        return enrollment_service.bulk_enroll_students(db=db, enrollments=enrollments)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.put("/cohorts/{cohort_id}/roster", response_model=RosterSyncResult)
+def sync_cohort_roster(
+    cohort_id: int,
+    roster: CohortRosterUpdate,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Replace a cohort's roster with the given set of students.
+    Students not in the set are un-enrolled and their marks deleted.
+    - **Permissions**: admin, sub_admin, or a lab_head/teacher from the cohort's lab.
+    """
+    cohort = db.query(EnrollmentCohort).filter(EnrollmentCohort.id == cohort_id).first()
+    if not cohort:
+        raise HTTPException(
+            status_code=404, detail=f"Cohort with id {cohort_id} not found."
+        )
+    if not check_lab_permission(current_user, cohort.lab_id):
+        raise HTTPException(
+            status_code=403, detail="Not authorized to manage this cohort's roster"
+        )
+    try:
+        return enrollment_service.sync_cohort_roster(
+            db=db, cohort_id=cohort_id, student_ids=roster.student_user_ids
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/me/", response_model=List[StudentEnrollmentDetails])
 def read_my_enrollments(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get all cohort enrollments for the current student."""
     if current_user.role != UserRole.student:
@@ -120,7 +197,7 @@ def read_my_enrollments(
 
 @router.get("/teachers/me/assignments/", response_model=List[TeacherAssignmentDetails])
 def read_my_assignments(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get all cohort assignments for the current teacher/lab head."""
     if current_user.role not in [UserRole.teacher, UserRole.lab_head]:
@@ -134,7 +211,7 @@ def read_my_assignments(
 def unenroll_a_student(
     enrollment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Un-enroll a student from a cohort.
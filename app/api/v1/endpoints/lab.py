@@ -5,7 +5,8 @@ from typing import Optional
 from app.schemas.lab import Lab, LabCreate, LabUpdate, PaginatedLabsResponse
 from app.services import lab_service
 from app.api.dependencies import get_db, RoleChecker
-from app.models.user import User, UserRole
+from app.core.user_cache import CurrentUser
+from app.models.user import UserRole
 
 router = APIRouter()
 
@@ -17,7 +18,7 @@ admin_permission = RoleChecker([UserRole.admin, UserRole.sub_admin])
 def create_lab(
     lab: LabCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),
+    current_user: CurrentUser = Depends(admin_permission),
 ):
     """
     Create a new lab.
@@ -38,7 +39,9 @@ def read_labs(
     limit: int = 10,
     search: Optional[str] = None,
     school_id: Optional[int] = None,
-    current_user: User = Depends(RoleChecker([UserRole.admin, UserRole.sub_admin])),
+    current_user: CurrentUser = Depends(
+        RoleChecker([UserRole.admin, UserRole.sub_admin])
+    ),
 ):
     """
     Retrieve all labs with pagination, search, and filtering by school.
@@ -53,7 +56,7 @@ def read_labs(
 def read_lab(
     lab_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),
+    current_user: CurrentUser = Depends(admin_permission),
 ):
     """
     Retrieve a single lab by its ID.
@@ -70,7 +73,7 @@ def update_lab(
     lab_id: int,
     lab_update: LabUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),
+    current_user: CurrentUser = Depends(admin_permission),
 ):
     """
     Update a lab's details.
@@ -88,7 +91,7 @@ def update_lab(
 def delete_lab(
     lab_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),
+    current_user: CurrentUser = Depends(admin_permission),
 ):
     """
     Delete a lab.
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from enum import Enum
 from typing import List, Union
 
 from app.services import leaderboard_service
-from app.api.dependencies import get_db, RoleChecker
-from app.models.user import User, UserRole
+from app.api.dependencies import get_async_read_db, get_current_user, RoleChecker
+from app.core.user_cache import CurrentUser
+from app.models.user import UserRole
 from app.schemas.leaderboard import (
     LeaderboardStudentEntry,
     LeaderboardProjectEntry,
+    LeaderboardRank,
     LeaderboardUser,
 )
 
@@ -32,33 +34,32 @@ class LeaderboardPeriod(str, Enum):
     "/",
     response_model=Union[List[LeaderboardStudentEntry], List[LeaderboardProjectEntry]],
 )
-def get_leaderboards(
+async def get_leaderboards(
     type: LeaderboardType = Query(..., description="Type of leaderboard"),
     period: LeaderboardPeriod = Query(
         LeaderboardPeriod.month, description="Time period for the leaderboard"
     ),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),
+    limit: int = Query(10, ge=1, le=100, description="Number of entries"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(admin_permission),
 ):
     """
     Get filterable leaderboards for top students or projects.
     """
-    results = leaderboard_service.get_leaderboard(
-        db, item_type=type.value, period=period.value
+    results = await leaderboard_service.get_ranked_leaderboard_async(
+        db, item_type=type.value, period=period.value, limit=limit
     )
 
     if type == LeaderboardType.student:
-        # FIX: Correctly populate the Pydantic model from the dictionary
         return [
             LeaderboardStudentEntry(
-                rank=i + 1,
-                student=LeaderboardUser.model_validate(r["user"]),
-                score=r["score"],
+                rank=rank,
+                student=LeaderboardUser.model_validate(user),
+                score=score,
             )
-            for i, r in enumerate(results)
+            for rank, user, score in results
         ]
     elif type == LeaderboardType.project:
-        # FIX: Correctly populate the Pydantic model from the (Project, star_count) tuple
         return [
             LeaderboardProjectEntry(
                 id=p.id,
@@ -66,6 +67,32 @@ def get_leaderboards(
                 author=LeaderboardUser.model_validate(p.student),
                 star_count=s_count,
             )
-            for p, s_count in results
+            for rank, p, s_count in results
         ]
     return []
+
+
+@router.get("/students/{student_id}/rank", response_model=LeaderboardRank)
+async def get_student_rank(
+    student_id: int,
+    period: LeaderboardPeriod = Query(
+        LeaderboardPeriod.month, description="Time period for the leaderboard"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Get a student's rank on the student leaderboard.
+    - **Permissions**: admin, sub_admin, or the student themselves.
+    """
+    if (
+        current_user.role not in [UserRole.admin, UserRole.sub_admin]
+        and current_user.id != student_id
+    ):
+        raise HTTPException(status_code=403, detail="Not authorized to view this rank")
+    rank, score, ranked = await leaderboard_service.get_student_rank_async(
+        db, student_id=student_id, period=period.value
+    )
+    return LeaderboardRank(
+        student_id=student_id, rank=rank, score=score, ranked_students=ranked
+    )
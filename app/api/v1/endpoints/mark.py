@@ -1,11 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import io
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.schemas.mark import Mark, MarkCreate, MarkUpdate
+from app.schemas.mark import (
+    Mark,
+    MarkCreate,
+    MarkUpdate,
+    MarkBatchUpdate,
+    MarkBatchUpdateResult,
+    MarksImportResult,
+)
 from app.services import mark_service
 from app.api.dependencies import get_db, get_current_user, RoleChecker
-from app.models.user import User, UserRole
+from app.core.user_cache import CurrentUser
+from app.models.user import UserRole
 from app.models.enrollment import StudentEnrollment, EnrollmentCohort
 from app.models.mark import Mark as MarkModel
 
@@ -18,7 +27,7 @@ student_permission = RoleChecker([UserRole.student])
 
 
 def check_staff_permission_for_enrollment(
-    db: Session, current_user: User, enrollment_id: int
+    db: Session, current_user: CurrentUser, enrollment_id: int
 ):
     enrollment = (
         db.query(StudentEnrollment)
@@ -31,7 +40,7 @@ def check_staff_permission_for_enrollment(
     lab_id = enrollment.cohort.lab_id
     if current_user.role in [UserRole.admin, UserRole.sub_admin]:
         return True
-    if current_user.teacher_profile and current_user.teacher_profile.lab_id == lab_id:
+    if current_user.lab_id is not None and current_user.lab_id == lab_id:
         return True
     raise HTTPException(
         status_code=403, detail="Not authorized to manage marks for this enrollment"
@@ -47,7 +56,7 @@ def add_mark_to_enrollment(
     enrollment_id: int,
     mark: MarkCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(staff_permission),
+    current_user: CurrentUser = Depends(staff_permission),
 ):
     check_staff_permission_for_enrollment(db, current_user, enrollment_id)
     db_mark = mark_service.create_mark_for_enrollment(
@@ -58,11 +67,48 @@ def add_mark_to_enrollment(
     return db_mark
 
 
+@router.post(
+    "/cohorts/{cohort_id}/marks/import/",
+    response_model=MarksImportResult,
+    status_code=status.HTTP_201_CREATED,
+)
+def import_marks_for_cohort(
+    cohort_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(staff_permission),
+):
+    """
+    Import marks for a cohort from a CSV file with the columns
+    `student_id,mobile_number,assessment_name,marks_obtained,total_marks`; each
+    row gives exactly one of student_id (user id) and mobile_number.
+    Returns the number of imported rows and the failed rows.
+    - **Permissions**: admin, sub_admin, lab_head, teacher (of the correct lab)
+    """
+    cohort = db.query(EnrollmentCohort).filter(EnrollmentCohort.id == cohort_id).first()
+    if not cohort:
+        raise HTTPException(status_code=404, detail="Cohort not found")
+    if current_user.role not in [UserRole.admin, UserRole.sub_admin] and (
+        current_user.lab_id is None or current_user.lab_id != cohort.lab_id
+    ):
+        raise HTTPException(
+            status_code=403, detail="Not authorized to manage marks for this cohort"
+        )
+    # The upload is spooled to disk by the server and read line by line here.
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return mark_service.import_marks_csv(db, cohort_id=cohort_id, lines=lines)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        lines.detach()
+
+
 @router.get("/enrollments/{enrollment_id}/marks/", response_model=List[Mark])
 def read_marks_for_enrollment(
     enrollment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(staff_permission),
+    current_user: CurrentUser = Depends(staff_permission),
 ):
     check_staff_permission_for_enrollment(db, current_user, enrollment_id)
     return mark_service.get_marks_for_enrollment(db=db, enrollment_id=enrollment_id)
@@ -73,7 +119,7 @@ def update_a_mark(
     mark_id: int,
     mark_data: MarkUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(staff_permission),
+    current_user: CurrentUser = Depends(staff_permission),
 ):
     """
     Update a mark.
@@ -88,8 +134,62 @@ def update_a_mark(
     return mark_service.update_mark(db, mark_id=mark_id, mark_data=mark_data)
 
 
+@router.patch("/marks/", response_model=MarkBatchUpdateResult)
+def update_marks_in_batch(
+    batch: MarkBatchUpdate,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(staff_permission),
+):
+    """
+    Update many marks at once, e.g. when editing a grade book.
+    Only the fields given for a mark are changed. If any mark would end up
+    invalid (negative, above its total, or a total of 1000 or more), nothing
+    is written and a 400 names the mark.
+    - **Permissions**: admin, sub_admin, lab_head, teacher (of the marks' labs)
+    """
+    mark_ids = [item.id for item in batch.marks]
+    if len(set(mark_ids)) != len(mark_ids):
+        raise HTTPException(status_code=400, detail="Each mark may appear only once")
+
+    # One query scopes every mark to the lab of its enrollment's cohort and
+    # reads the stored scores the merged values are validated against.
+    rows = (
+        db.query(
+            MarkModel.id,
+            EnrollmentCohort.lab_id,
+            MarkModel.marks_obtained,
+            MarkModel.total_marks,
+        )
+        .join(StudentEnrollment, MarkModel.enrollment_id == StudentEnrollment.id)
+        .join(EnrollmentCohort, StudentEnrollment.cohort_id == EnrollmentCohort.id)
+        .filter(MarkModel.id.in_(mark_ids))
+        .all()
+    )
+    mark_labs = {mark_id: lab_id for mark_id, lab_id, _, _ in rows}
+    current = {mark_id: (obtained, total) for mark_id, _, obtained, total in rows}
+    missing_ids = set(mark_ids) - set(mark_labs)
+    if missing_ids:
+        raise HTTPException(
+            status_code=404, detail=f"Marks with ids {missing_ids} not found"
+        )
+    if current_user.role not in [UserRole.admin, UserRole.sub_admin] and any(
+        current_user.lab_id is None or lab_id != current_user.lab_id
+        for lab_id in mark_labs.values()
+    ):
+        raise HTTPException(
+            status_code=403, detail="Not authorized to manage some of these marks"
+        )
+
+    try:
+        updated = mark_service.update_marks(db, updates=batch.marks, current=current)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"updated": updated}
+
+
 @router.get("/me/marks/", response_model=List[Mark])
 def read_my_marks(
-    db: Session = Depends(get_db), current_user: User = Depends(student_permission)
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(student_permission),
 ):
     return mark_service.get_marks_for_student(db=db, student_id=current_user.id)
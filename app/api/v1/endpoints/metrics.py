@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, Query, status
+from typing import List
+
+from app.schemas.metrics import (
+    PasswordHashingStats,
+    DatabasePoolStats,
+    SlowQuery,
+    DashboardSectionTiming,
+    LabDashboardCacheStats,
+)
+from app.api.dependencies import RoleChecker
+from app.core.security import password_hasher
+from app.db.pool import pool_stats
+from app.db.slow_queries import slow_query_log
+from app.db.session import (
+    engine,
+    async_engine,
+    replica_engine,
+    async_replica_engine,
+)
+from app.core.dashboard_cache import lab_dashboard_cache
+from app.services.dashboard_service import LAB_DASHBOARD_SECTIONS, section_timings
+from app.core.user_cache import CurrentUser
+from app.models.user import UserRole
+
+router = APIRouter()
+
+admin_permission = RoleChecker([UserRole.admin, UserRole.sub_admin])
+
+
+@router.get("/password-hashing", response_model=PasswordHashingStats)
+def read_password_hashing_stats(current_user: CurrentUser = Depends(admin_permission)):
+    """
+    Retrieve queue depth and latency of the password hashing executor.
+    - **Permissions**: admin, sub_admin
+    """
+    return password_hasher.stats()
+
+
+@router.get("/db-pool", response_model=DatabasePoolStats)
+def read_db_pool_stats(current_user: CurrentUser = Depends(admin_permission)):
+    """
+    Retrieve connection pool usage: checked-out connections, overflow,
+    checkout wait time and timeouts. Replica pools are null when no replica is configured.
+    - **Permissions**: admin, sub_admin
+    """
+    return {
+        "sync_pool": pool_stats(engine),
+        "async_pool": pool_stats(async_engine.sync_engine) if async_engine else None,
+        "replica_pool": pool_stats(replica_engine) if replica_engine else None,
+        "async_replica_pool": (
+            pool_stats(async_replica_engine.sync_engine)
+            if async_replica_engine
+            else None
+        ),
+    }
+
+
+@router.get("/slow-queries", response_model=List[SlowQuery])
+def read_slow_queries(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: CurrentUser = Depends(admin_permission),
+):
+    """
+    List statements slower than SLOW_QUERY_THRESHOLD_MS, worst total time first,
+    with their last parameters, call site and (for the worst ones) query plan.
+    - **Permissions**: admin, sub_admin
+    """
+    return slow_query_log.top(limit)
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries(current_user: CurrentUser = Depends(admin_permission)):
+    """
+    Reset the slow-query log.
+    - **Permissions**: admin, sub_admin
+    """
+    slow_query_log.clear()
+
+
+@router.get("/dashboard-sections", response_model=List[DashboardSectionTiming])
+def read_dashboard_section_timings(
+    current_user: CurrentUser = Depends(admin_permission),
+):
+    """
+    Retrieve the average and maximum latency of each lab dashboard section.
+    - **Permissions**: admin, sub_admin
+    """
+    return section_timings.stats()
+
+
+@router.delete("/dashboard-sections", status_code=status.HTTP_204_NO_CONTENT)
+def clear_dashboard_section_timings(
+    current_user: CurrentUser = Depends(admin_permission),
+):
+    """
+    Reset the dashboard section timings.
+    - **Permissions**: admin, sub_admin
+    """
+    section_timings.clear()
+
+
+@router.get("/lab-dashboard-cache", response_model=LabDashboardCacheStats)
+def read_lab_dashboard_cache_stats(
+    current_user: CurrentUser = Depends(admin_permission),
+):
+    """
+    Retrieve hit/miss counters of the lab dashboard cache and the database
+    work it saved (each hit skips one query per dashboard section).
+    - **Permissions**: admin, sub_admin
+    """
+    stats = lab_dashboard_cache.stats()
+    return {**stats, "queries_saved": stats["hits"] * len(LAB_DASHBOARD_SECTIONS)}
@@ -1,13 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from typing import List
-
-from app.schemas.project import Project, ProjectCreate, ProjectUpdate
+from typing import List, Optional
+
+from app.schemas.project import (
+    Project,
+    ProjectCreate,
+    ProjectUpdate,
+    ProjectStarUpdate,
+    ProjectStarStatus,
+)
 from app.services import project_service
 from app.api.dependencies import get_db, get_current_user, RoleChecker
-from app.models.user import User, UserRole
-from app.models.project import Project as ProjectModel, ProjectStar
+from app.core.user_cache import CurrentUser
+from app.models.user import UserRole
+from app.models.project import Project as ProjectModel
 
 router = APIRouter()
 
@@ -17,10 +23,10 @@ staff_permission = RoleChecker(
 )
 
 
-def check_lab_permission(current_user: User, lab_id: int):
+def check_lab_permission(current_user: CurrentUser, lab_id: int):
     if current_user.role in [UserRole.admin, UserRole.sub_admin]:
         return True
-    if current_user.teacher_profile and current_user.teacher_profile.lab_id == lab_id:
+    if current_user.lab_id is not None and current_user.lab_id == lab_id:
         return True
     return False
 
@@ -29,7 +35,7 @@ def check_lab_permission(current_user: User, lab_id: int):
 def submit_project(
     project: ProjectCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(student_permission),
+    current_user: CurrentUser = Depends(student_permission),
 ):
     db_project = project_service.create_project(
         db=db, project_data=project, student_id=current_user.id
@@ -57,7 +63,7 @@ def submit_project(
 def read_projects_in_lab(
     lab_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(staff_permission),
+    current_user: CurrentUser = Depends(staff_permission),
 ):
     if not check_lab_permission(current_user, lab_id):
         raise HTTPException(
@@ -85,7 +91,7 @@ def update_a_project(
     project_id: int,
     project_data: ProjectUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(student_permission),
+    current_user: CurrentUser = Depends(student_permission),
 ):
     """
     Update a project's details.
@@ -108,12 +114,6 @@ def update_a_project(
         db, project_id=project_id, project_data=project_data
     )
 
-    star_count = (
-        db.query(func.count(ProjectStar.id))
-        .filter(ProjectStar.project_id == project_id)
-        .scalar()
-    )
-
     return Project(
         id=updated_project.id,
         project_name=updated_project.project_name,
@@ -122,30 +122,53 @@ def update_a_project(
         photo_urls=updated_project.photo_urls,
         submission_date=updated_project.submission_date,
         author=updated_project.student,
-        star_count=star_count,
+        star_count=updated_project.star_count,
     )
 
 
-@router.post("/{project_id}/star", status_code=status.HTTP_200_OK)
+@router.post(
+    "/{project_id}/star",
+    response_model=ProjectStarStatus,
+    status_code=status.HTTP_200_OK,
+)
 def star_a_project(
     project_id: int,
+    star_data: Optional[ProjectStarUpdate] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(staff_permission),
+    current_user: CurrentUser = Depends(staff_permission),
 ):
-    was_starred = project_service.star_unstar_project(
-        db=db, project_id=project_id, user_id=current_user.id
-    )
-    if was_starred:
-        return {"message": "Project starred successfully"}
+    """
+    Star or unstar a project.
+    Without a body (or with `starred` unset) the star is toggled. Sending
+    `{"starred": true}` or `{"starred": false}` sets that state, so retries are safe.
+    - **Permissions**: admin, sub_admin, lab_head, teacher
+    """
+    if star_data is None or star_data.starred is None:
+        result = project_service.star_unstar_project(
+            db=db, project_id=project_id, user_id=current_user.id
+        )
     else:
-        return {"message": "Project unstarred successfully"}
+        result = project_service.set_project_star(
+            db=db,
+            project_id=project_id,
+            user_id=current_user.id,
+            starred=star_data.starred,
+        )
+    if result is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    starred, star_count = result
+    message = (
+        "Project starred successfully" if starred else "Project unstarred successfully"
+    )
+    return {"message": message, "starred": starred, "star_count": star_count}
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_a_project(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Delete a project.
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import Optional
 
 from app.schemas.report import LabReport, TopStudentReport
 from app.services import report_service
-from app.api.dependencies import get_db, RoleChecker
-from app.models.user import User, UserRole
+from app.api.dependencies import get_read_db, RoleChecker
+from app.core.user_cache import CurrentUser
+from app.models.user import UserRole
 
 router = APIRouter()
 
@@ -18,8 +20,8 @@ staff_permission = RoleChecker(
 @router.get("/lab-report/{cohort_id}", response_model=LabReport)
 def get_lab_report(
     cohort_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(staff_permission),
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(staff_permission),
 ):
     """
     Generate a detailed report for a specific cohort.
@@ -35,11 +37,23 @@ def get_lab_report(
 def get_top_student_report(
     month: int = Query(datetime.now().month, ge=1, le=12),
     year: int = Query(datetime.now().year, ge=2020),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(staff_permission),
+    limit: int = Query(100, ge=1, le=500),
+    after_rank: Optional[int] = Query(None, ge=0),
+    after_student_id: Optional[int] = Query(None),
+    db: Session = Depends(get_read_db),
+    current_user: CurrentUser = Depends(staff_permission),
 ):
     """
     Generate a ranked report of top students for a given month and year.
+    Paginated: pass the returned `next_after_rank` / `next_after_student_id`
+    to get the following page. Tied students share a rank.
     - **Permissions**: admin, sub_admin, lab_head, teacher
     """
-    return report_service.generate_top_student_report(db, month=month, year=year)
+    return report_service.generate_top_student_report(
+        db,
+        month=month,
+        year=year,
+        limit=limit,
+        after_rank=after_rank,
+        after_student_id=after_student_id,
+    )
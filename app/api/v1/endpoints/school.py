@@ -10,7 +10,8 @@ from app.schemas.school import (
 )
 from app.services import school_service
 from app.api.dependencies import get_db, RoleChecker
-from app.models.user import User, UserRole
+from app.core.user_cache import CurrentUser
+from app.models.user import UserRole
 
 router = APIRouter()
 
@@ -22,7 +23,7 @@ admin_permission = RoleChecker([UserRole.admin, UserRole.sub_admin])
 def create_school(
     school: SchoolCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),
+    current_user: CurrentUser = Depends(admin_permission),
 ):
     """
     Create a new school.
@@ -37,7 +38,9 @@ def read_schools(
     skip: int = 0,
     limit: int = 10,
     search: Optional[str] = None,
-    current_user: User = Depends(RoleChecker([UserRole.admin, UserRole.sub_admin])),
+    current_user: CurrentUser = Depends(
+        RoleChecker([UserRole.admin, UserRole.sub_admin])
+    ),
 ):
     """
     Retrieve all schools with pagination and search.
@@ -52,7 +55,7 @@ def read_schools(
 def read_school(
     school_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),
+    current_user: CurrentUser = Depends(admin_permission),
 ):
     """
     Retrieve a single school by its ID.
@@ -69,7 +72,7 @@ def update_school(
     school_id: int,
     school_update: SchoolUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),
+    current_user: CurrentUser = Depends(admin_permission),
 ):
     """
     Update a school's details.
@@ -87,7 +90,7 @@ def update_school(
 def delete_school(
     school_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),
+    current_user: CurrentUser = Depends(admin_permission),
 ):
     """
     Delete a school.
@@ -10,6 +10,7 @@ from app.schemas.student import (
 )
 from app.services import student_service
 from app.api.dependencies import get_db, get_current_user
+from app.core.user_cache import CurrentUser
 from app.models.user import User, UserRole
 from app.models.enrollment import (
     EnrollmentCohort,
@@ -20,7 +21,7 @@ from app.models.enrollment import (
 router = APIRouter()
 
 
-def check_lab_permission(current_user: User, lab_id: int):
+def check_lab_permission(current_user: CurrentUser, lab_id: int):
     """
     Helper function to verify if a user has permission for a lab.
     Admins have universal access. Lab Heads and Teachers must be assigned to the lab.
@@ -28,10 +29,7 @@ def check_lab_permission(current_user: User, lab_id: int):
     if current_user.role in [UserRole.admin, UserRole.sub_admin]:
         return True
     if current_user.role in [UserRole.lab_head, UserRole.teacher]:
-        if (
-            current_user.teacher_profile
-            and current_user.teacher_profile.lab_id == lab_id
-        ):
+        if current_user.lab_id is not None and current_user.lab_id == lab_id:
             return True
     return False
 
@@ -45,7 +43,7 @@ def create_students_in_bulk(
     lab_id: int,
     bulk_data: StudentBulkCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Create multiple new students within a specific lab in a single transaction.
@@ -54,17 +52,9 @@ def create_students_in_bulk(
     if not check_lab_permission(current_user, lab_id):
         raise HTTPException(status_code=403, detail="Not authorized to manage this lab")
     try:
-        created_users = student_service.bulk_create_students_in_lab(
+        return student_service.bulk_create_students_in_lab(
             db=db, students_data=bulk_data.students, lab_id=lab_id
         )
-        # FIX: Consistently validate the profile for the response
-        response = []
-        for user in created_users:
-            profile_details = StudentProfileDetails.model_validate(
-                user.student_profile or {}
-            )
-            response.append(Student(user=user, profile=profile_details))
-        return response
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception:
@@ -79,7 +69,7 @@ def read_students_in_lab(
     standard: Optional[int] = None,
     section: Optional[LabSection] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Retrieve all students for a specific lab.
@@ -108,7 +98,7 @@ def search_for_students(
     school_id: Optional[int] = None,
     lab_id: Optional[int] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     if current_user.role not in [UserRole.admin, UserRole.sub_admin]:
         raise HTTPException(
@@ -134,7 +124,7 @@ def update_a_student(
     student_id: int,
     student_data: StudentUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Update a student's details.
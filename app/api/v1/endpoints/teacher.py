@@ -1,27 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.schemas.teacher import Teacher, TeacherCreate, TeacherUpdate
 from app.services import teacher_service
 from app.api.dependencies import get_db, get_current_user
-from app.models.user import User, UserRole
+from app.core.security import get_password_hash_async
+from app.core.user_cache import CurrentUser
+from app.models.user import UserRole
 
 router = APIRouter()
 
 
-def check_lab_permission(current_user: User, lab_id: int):
+def check_lab_permission(current_user: CurrentUser, lab_id: int):
     """
     Helper function to verify if a user has permission for a lab.
     Admins have universal access. Lab Heads must be assigned to the lab.
     """
     if current_user.role in [UserRole.admin, UserRole.sub_admin]:
         return True
-    # FIX: Check for existence of teacher_profile before accessing its attributes
     if (
         current_user.role == UserRole.lab_head
-        and current_user.teacher_profile
-        and current_user.teacher_profile.lab_id == lab_id
+        and current_user.lab_id is not None
+        and current_user.lab_id == lab_id
     ):
         return True
     return False
@@ -32,11 +34,11 @@ def check_lab_permission(current_user: User, lab_id: int):
     response_model=Teacher,
     status_code=status.HTTP_201_CREATED,
 )
-def create_teacher(
+async def create_teacher(
     lab_id: int,
     teacher: TeacherCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Create a new teacher within a specific lab.
@@ -45,14 +47,24 @@ def create_teacher(
     if not check_lab_permission(current_user, lab_id):
         raise HTTPException(status_code=403, detail="Not authorized to manage this lab")
 
-    db_teacher = teacher_service.create_teacher_in_lab(
-        db=db, teacher_data=teacher, lab_id=lab_id
+    hashed_password = await get_password_hash_async(teacher.password)
+    db_teacher = await run_in_threadpool(
+        teacher_service.create_teacher_in_lab,
+        db=db,
+        teacher_data=teacher,
+        lab_id=lab_id,
+        hashed_password=hashed_password,
     )
     if db_teacher is None:
         raise HTTPException(
             status_code=400, detail="A user with this mobile number already exists."
         )
 
+    # Reading the profile and skills may lazy-load, so keep it off the event loop
+    return await run_in_threadpool(_teacher_response, db_teacher)
+
+
+def _teacher_response(db_teacher) -> Teacher:
     teacher_profile = db_teacher.teacher_profile
     skills = [skill.skill_name for skill in db_teacher.skills]
     return Teacher(
@@ -68,7 +80,7 @@ def create_teacher(
 def read_teachers_in_lab(
     lab_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Retrieve all teachers for a specific lab.
@@ -101,7 +113,7 @@ def update_a_teacher(
     teacher_id: int,
     teacher_data: TeacherUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Update a teacher's details.
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 
@@ -10,8 +11,15 @@ from app.schemas.user import (
     UserUpdate,
     PaginatedUsersResponse,
 )
-from app.services import user_service
-from app.api.dependencies import get_db, get_current_user, RoleChecker
+from app.services import user_service, refresh_token_service
+from app.api.dependencies import (
+    get_db,
+    get_current_user,
+    get_current_db_user,
+    RoleChecker,
+)
+from app.core.security import get_password_hash_async, verify_password_async
+from app.core.user_cache import CurrentUser
 from app.models.user import User, UserRole, TeacherProfile
 from app.models.lab import Lab
 from app.models.enrollment import StudentEnrollment, EnrollmentCohort
@@ -21,7 +29,7 @@ admin_permission = RoleChecker([UserRole.admin, UserRole.sub_admin])
 
 
 @router.get("/me/", response_model=UserSchema)
-def read_current_user(current_user: User = Depends(get_current_user)):
+def read_current_user(current_user: User = Depends(get_current_db_user)):
     """
     Get the profile of the currently authenticated user.
     """
@@ -32,34 +40,46 @@ def read_current_user(current_user: User = Depends(get_current_user)):
 def update_current_user(
     data: UserMeUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_db_user),
 ):
     """Update the profile of the currently authenticated user."""
     return user_service.update_me(db=db, user=current_user, data=data)
 
 
 @router.post("/me/change-password")
-def change_current_user_password(
+async def change_current_user_password(
     data: UserPasswordChange,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_db_user),
 ):
-    """Change the password of the currently authenticated user."""
-    success = user_service.change_password(db=db, user=current_user, data=data)
-    if not success:
+    """
+    Change the password of the currently authenticated user.
+    Every issued access and refresh token is revoked, so the user logs in again.
+    bcrypt runs on the dedicated hashing executor, not on a request thread.
+    """
+    if not await verify_password_async(
+        data.current_password, current_user.password_hash
+    ):
         raise HTTPException(status_code=400, detail="Incorrect current password")
+    hashed_password = await get_password_hash_async(data.new_password)
+    await run_in_threadpool(
+        user_service.change_password,
+        db,
+        user=current_user,
+        data=data,
+        hashed_password=hashed_password,
+    )
+    # A new password signs out every other client holding a refresh token
+    await run_in_threadpool(
+        refresh_token_service.revoke_user_refresh_tokens, db, user_id=current_user.id
+    )
     return {"message": "Password changed successfully"}
 
 
-@router.post("/{user_id}/reset-password", status_code=status.HTTP_200_OK)
-def reset_password_by_superior(
-    user_id: int,
-    data: AdminPasswordReset,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
+def _get_resettable_user(db: Session, current_user: CurrentUser, user_id: int) -> User:
     """
-    Reset a user's password. Permissions are hierarchical.
+    Returns the user whose password current_user may reset.
+    Permissions are hierarchical:
     - Admins can reset any non-admin user.
     - Lab Heads can reset teachers and students in their lab.
     - Teachers can reset students in their lab.
@@ -90,11 +110,7 @@ def reset_password_by_superior(
     # Lab Head logic
     elif current_role == UserRole.lab_head:
         if target_role in [UserRole.teacher, UserRole.student]:
-            lab_id = (
-                current_user.teacher_profile.lab_id
-                if current_user.teacher_profile
-                else None
-            )
+            lab_id = current_user.lab_id
             if lab_id:
                 if (
                     target_role == UserRole.teacher
@@ -118,11 +134,7 @@ def reset_password_by_superior(
     # Teacher logic
     elif current_role == UserRole.teacher:
         if target_role == UserRole.student:
-            lab_id = (
-                current_user.teacher_profile.lab_id
-                if current_user.teacher_profile
-                else None
-            )
+            lab_id = current_user.lab_id
             if lab_id:
                 is_in_lab = (
                     db.query(StudentEnrollment)
@@ -141,9 +153,37 @@ def reset_password_by_superior(
             status_code=403,
             detail="You do not have permission to reset this user's password.",
         )
+    return target_user
+
 
-    user_service.reset_user_password(
-        db, user=target_user, new_password=data.new_password
+@router.post("/{user_id}/reset-password", status_code=status.HTTP_200_OK)
+async def reset_password_by_superior(
+    user_id: int,
+    data: AdminPasswordReset,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Reset a user's password. Permissions are hierarchical.
+    - Admins can reset any non-admin user.
+    - Lab Heads can reset teachers and students in their lab.
+    - Teachers can reset students in their lab.
+    The new password is hashed on the dedicated hashing executor after the
+    permission check, so rejected requests never spend bcrypt time.
+    """
+    target_user = await run_in_threadpool(
+        _get_resettable_user, db, current_user, user_id
+    )
+    hashed_password = await get_password_hash_async(data.new_password)
+    await run_in_threadpool(
+        user_service.reset_user_password,
+        db,
+        user=target_user,
+        new_password=data.new_password,
+        hashed_password=hashed_password,
+    )
+    await run_in_threadpool(
+        refresh_token_service.revoke_user_refresh_tokens, db, user_id=target_user.id
     )
     return {
         "message": f"Password for user {target_user.name} has been reset successfully."
@@ -152,7 +192,7 @@ def reset_password_by_superior(
 
 @router.get("/", response_model=List[UserSchema])
 def read_all_users(
-    db: Session = Depends(get_db), current_user: User = Depends(admin_permission)
+    db: Session = Depends(get_db), current_user: CurrentUser = Depends(admin_permission)
 ):
     """Retrieve all users. Admin only."""
     # This requires a new service function, for now we can do a simple query
@@ -164,7 +204,7 @@ def update_user_details(
     user_id: int,
     data: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),
+    current_user: CurrentUser = Depends(admin_permission),
 ):
     """Update a user's details. Admin only."""
     user_to_update = user_service.get_user_by_id(db, user_id=user_id)
@@ -177,7 +217,7 @@ def update_user_details(
 def delete_a_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(admin_permission),
+    current_user: CurrentUser = Depends(admin_permission),
 ):
     """Delete a user. Admin only."""
     if user_id == current_user.id:
@@ -199,7 +239,7 @@ def search_for_users(
     skip: int = 0,
     limit: int = 10,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Search for users with advanced filters and pagination.
@@ -237,11 +277,7 @@ def search_for_users(
             )
 
     if current_user.role not in [UserRole.admin, UserRole.sub_admin]:
-        user_lab_id = (
-            current_user.teacher_profile.lab_id
-            if current_user.teacher_profile
-            else None
-        )
+        user_lab_id = current_user.lab_id
         if not user_lab_id:
             raise HTTPException(
                 status_code=403, detail="You are not assigned to a lab."
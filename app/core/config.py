@@ -1,10 +1,73 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./test.db"
+    # Optional; derived from DATABASE_URL (asyncpg / aiosqlite) when not set
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Optional read replica for dashboards, leaderboards and reports
+    REPLICA_DATABASE_URL: Optional[str] = None
+    ASYNC_REPLICA_DATABASE_URL: Optional[str] = None
+    # After a user commits a write, their reads stay on the primary this long
+    READ_YOUR_WRITES_SECONDS: int = 10
+
+    # Per-request SQL statement counting (X-DB-Query-* headers and logs)
+    QUERY_STATS_ENABLED: bool = True
+    # A statement repeated this many times in one request is logged as an N+1 candidate
+    N_PLUS_ONE_THRESHOLD: int = 5
+    # Turn lazy relationship loads into errors; meant for development and tests
+    STRICT_LAZY_LOADS: bool = False
+
+    # Slow-query log; plans are captured for the SLOW_QUERY_EXPLAIN_TOP worst statements
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    SLOW_QUERY_MAX_ENTRIES: int = 200
+    SLOW_QUERY_EXPLAIN_TOP: int = 20
+
+    # Lab dashboard sections run concurrently, each on its own pooled connection;
+    # keep this below DB_POOL_SIZE + DB_MAX_OVERFLOW
+    DASHBOARD_MAX_CONCURRENCY: int = 4
+    # Per-process cache of computed lab dashboards, invalidated per lab on writes
+    LAB_DASHBOARD_CACHE_MAX_SIZE: int = 256
+    LAB_DASHBOARD_CACHE_TTL_SECONDS: int = 300
+
+    # In-memory leaderboards, rebuilt from the database this often (per process)
+    LEADERBOARD_IN_MEMORY: bool = True
+    LEADERBOARD_REFRESH_SECONDS: int = 300
+
+    # Connection pool sizing, shared by the sync and async engines
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables recycling
+    DB_POOL_PRE_PING: bool = True
+
     SECRET_KEY: str = "your-secret-key"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Used and revoked refresh tokens are kept this long, so replaying a rotated
+    # token is still detected as theft, and then pruned.
+    REFRESH_TOKEN_REVOKED_RETENTION_MINUTES: int = 60
+
+    # Per-process cache of authenticated user snapshots. A snapshot is the token
+    # claims plus the user's token_version, so the TTL is the revocation bound:
+    # workers other than the one that revoked a token (role change, password
+    # change or reset, lab deletion) keep accepting it for at most this long.
+    # 0 checks token_version against the database on every request.
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: int = 5
+
+    # Verified-token cache, so replayed tokens skip signature verification
+    TOKEN_CACHE_MAX_SIZE: int = 4096
+
+    # Dedicated bcrypt executor, kept separate from the request threadpool
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 2
+    # Process pool for bulk hashing (roster imports); 0 means one per CPU core
+    PASSWORD_HASH_PROCESSES: int = 0
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.enrollment import EnrollmentCohort, StudentEnrollment
+from app.models.user import TeacherProfile
+from app.schemas.dashboard import LabDashboardStats
+
+
+class LabDashboardCache:
+    """
+    A bounded, thread-safe TTL/LRU cache of computed lab dashboards keyed by lab id.
+    Writes that change a lab's numbers invalidate only that lab. Each lab has a
+    generation counter, so a dashboard computed while a write landed is not stored.
+    Dashboards read from the replica are not stored either while the lab was
+    invalidated less than replica_lag_seconds ago, as the replica may not have
+    the write yet. The TTL bounds staleness from writes made by other workers.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int, replica_lag_seconds: int = 0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.replica_lag_seconds = replica_lag_seconds
+        self._entries: "OrderedDict[int, tuple[float, LabDashboardStats]]" = (
+            OrderedDict()
+        )
+        self._generations: Dict[int, int] = {}
+        self._invalidated_at: Dict[int, float] = {}
+        self._cleared_at = float("-inf")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._compute_ms = 0.0
+
+    def get(self, lab_id: int) -> Tuple[Optional[LabDashboardStats], int]:
+        """Returns (cached stats or None, generation to pass back to set())."""
+        with self._lock:
+            generation = self._generations.get(lab_id, 0)
+            entry = self._entries.get(lab_id)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[lab_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None, generation
+            self.hits += 1
+            self._entries.move_to_end(lab_id)
+            return entry[1], generation
+
+    def set(
+        self,
+        lab_id: int,
+        stats: LabDashboardStats,
+        generation: int,
+        compute_ms: float = 0.0,
+        from_replica: bool = False,
+    ) -> None:
+        with self._lock:
+            self._compute_ms += compute_ms
+            if self.maxsize <= 0 or self.ttl_seconds <= 0:
+                return
+            if self._generations.get(lab_id, 0) != generation:
+                return  # Invalidated while being computed
+            now = time.monotonic()
+            if from_replica:
+                invalidated_at = max(
+                    self._invalidated_at.get(lab_id, float("-inf")), self._cleared_at
+                )
+                if now - invalidated_at < self.replica_lag_seconds:
+                    return  # The replica may still lag behind the last write
+            self._entries[lab_id] = (now + self.ttl_seconds, stats)
+            self._entries.move_to_end(lab_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, lab_ids: Iterable[int]) -> None:
+        with self._lock:
+            now = time.monotonic()
+            for lab_id in set(lab_ids):
+                self._generations[lab_id] = self._generations.get(lab_id, 0) + 1
+                self._invalidated_at[lab_id] = now
+                if self._entries.pop(lab_id, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drops every entry, for writes that touch many labs at once."""
+        with self._lock:
+            for lab_id in set(self._generations) | set(self._entries):
+                self._generations[lab_id] = self._generations.get(lab_id, 0) + 1
+            self._cleared_at = time.monotonic()
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            avg_compute_ms = self._compute_ms / self.misses if self.misses else 0.0
+            return {
+                "size": len(self._entries),
+                "max_size": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "avg_compute_ms": avg_compute_ms,
+                "compute_ms_saved": self.hits * avg_compute_ms,
+            }
+
+
+lab_dashboard_cache = LabDashboardCache(
+    maxsize=settings.LAB_DASHBOARD_CACHE_MAX_SIZE,
+    ttl_seconds=settings.LAB_DASHBOARD_CACHE_TTL_SECONDS,
+    replica_lag_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+def invalidate_labs_of_cohorts(db: Session, cohort_ids: Iterable[int]) -> None:
+    """Invalidates the dashboards of the labs owning the given cohorts."""
+    cohort_ids = set(cohort_ids)
+    if not cohort_ids:
+        return
+    lab_ids = db.query(EnrollmentCohort.lab_id).filter(
+        EnrollmentCohort.id.in_(cohort_ids)
+    )
+    lab_dashboard_cache.invalidate(row[0] for row in lab_ids.distinct())
+
+
+def invalidate_labs_of_user(db: Session, user_id: int) -> None:
+    """
+    Invalidates the dashboards of every lab the user belongs to: the labs of
+    their enrollments and the lab of their teacher profile.
+    """
+    enrollment_labs = (
+        db.query(EnrollmentCohort.lab_id)
+        .join(StudentEnrollment)
+        .filter(StudentEnrollment.student_user_id == user_id)
+    )
+    staff_labs = db.query(TeacherProfile.lab_id).filter(
+        TeacherProfile.user_id == user_id
+    )
+    lab_dashboard_cache.invalidate(
+        row[0] for row in enrollment_labs.union(staff_labs) if row[0] is not None
+    )
@@ -0,0 +1,210 @@
+import threading
+import time
+from datetime import datetime
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from app.core.config import settings
+from app.core.periods import Period, current_period
+
+# Leaderboard scoring: a student earns these points per project and per star received.
+PROJECT_POINTS = 10
+STAR_POINTS = 2
+
+PERIODS = ("month", "year", "all_time")
+
+
+class Ranking:
+    """
+    Positive integer scores kept in score order.
+    Updates, rank lookups and top-k reads are O(log n) (+ k), never a scan.
+    """
+
+    def __init__(self, scores: Optional[Dict[int, int]] = None):
+        self._scores: Dict[int, int] = {}
+        self._order = SortedList()  # (-score, item_id)
+        for item_id, score in (scores or {}).items():
+            self.add(item_id, score)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def add(self, item_id: int, delta: int) -> None:
+        old = self._scores.get(item_id, 0)
+        new = old + delta
+        if old > 0:
+            self._order.remove((-old, item_id))
+        if new > 0:
+            self._scores[item_id] = new
+            self._order.add((-new, item_id))
+        else:
+            self._scores.pop(item_id, None)
+
+    def score(self, item_id: int) -> int:
+        return self._scores.get(item_id, 0)
+
+    def rank(self, item_id: int) -> Optional[int]:
+        """1 + the number of items with a higher score (ties share a rank)."""
+        score = self._scores.get(item_id)
+        if score is None:
+            return None
+        return self._order.bisect_left((-score,)) + 1
+
+    def top(self, k: int) -> List[Tuple[int, int, int]]:
+        """The k best items as (rank, item_id, score)."""
+        entries = []
+        for position, (negative_score, item_id) in enumerate(self._order.islice(0, k)):
+            score = -negative_score
+            if entries and entries[-1][2] == score:
+                rank = entries[-1][0]
+            else:
+                rank = position + 1
+            entries.append((rank, item_id, score))
+        return entries
+
+
+class PeriodBoards:
+    """The student and project rankings of one time window."""
+
+    def __init__(
+        self,
+        period: Period,
+        students: Optional[Dict[int, int]] = None,
+        projects: Optional[Dict[int, int]] = None,
+    ):
+        self.period = period
+        self.students = Ranking(students)
+        self.projects = Ranking(projects)
+
+    def covers(self, moment: datetime) -> bool:
+        start, end = self.period.start, self.period.end
+        return (start is None or moment >= start) and (end is None or moment < end)
+
+
+class LeaderboardEngine:
+    """
+    In-memory month, year and all-time leaderboards.
+    Built from the database (see leaderboard_service.rebuild_leaderboards) and then
+    kept current by project_service after each committed project or star change.
+    Boards are per process, so they are rebuilt every LEADERBOARD_REFRESH_SECONDS
+    to pick up writes made by other workers. Every applied change bumps a
+    generation counter, so a rebuild that raced with a change can be detected.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._boards: Dict[str, PeriodBoards] = {}
+        self._built_at: Optional[float] = None
+        self._generation = 0
+        # Authors whose role is no longer student: their projects stay ranked,
+        # but they are kept off the student boards.
+        self._non_students: AbstractSet[int] = frozenset()
+        self._lock = threading.Lock()
+        self.rebuild_lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        built_at = self._built_at
+        return built_at is None or time.monotonic() - built_at >= self.refresh_seconds
+
+    def generation(self) -> int:
+        """The number of changes applied so far; taken before a rebuild reads the DB."""
+        with self._lock:
+            return self._generation
+
+    def load(
+        self,
+        boards: Dict[str, PeriodBoards],
+        generation: Optional[int] = None,
+        non_students: AbstractSet[int] = frozenset(),
+    ) -> bool:
+        """
+        Replaces every board with freshly computed ones and returns True.
+        If a change was applied since `generation` was taken, the build may have
+        missed it: the boards are then discarded and False is returned.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._boards = boards
+            self._non_students = frozenset(non_students)
+            self._built_at = time.monotonic()
+            return True
+
+    def invalidate(self) -> None:
+        """Forces a rebuild on the next read, e.g. after a bulk change."""
+        with self._lock:
+            self._built_at = None
+
+    def _current(self, name: str, now: datetime) -> PeriodBoards:
+        period = current_period(name, now)
+        boards = self._boards.get(name)
+        if boards is None or boards.period != period:
+            # A new month/year began after the last rebuild, so every change in
+            # it has been applied here: it starts out empty.
+            boards = self._boards[name] = PeriodBoards(period)
+        return boards
+
+    def _apply(self, moment: datetime, student_id: int, project_id: int, **deltas):
+        self._generation += 1
+        if self._built_at is None:
+            return
+        now = datetime.utcnow()
+        for name in PERIODS:
+            boards = self._current(name, now)
+            if moment is None or not boards.covers(moment):
+                continue
+            if student_id not in self._non_students:
+                boards.students.add(student_id, deltas.get("student", 0))
+            if deltas.get("project"):
+                boards.projects.add(project_id, deltas["project"])
+
+    def project_created(
+        self, project_id: int, student_id: int, submitted_at: datetime
+    ) -> None:
+        with self._lock:
+            self._apply(submitted_at, student_id, project_id, student=PROJECT_POINTS)
+
+    def project_deleted(
+        self,
+        project_id: int,
+        student_id: int,
+        submitted_at: datetime,
+        starred_at: Iterable[datetime],
+    ) -> None:
+        with self._lock:
+            self._apply(submitted_at, student_id, project_id, student=-PROJECT_POINTS)
+            for moment in starred_at:
+                self._apply(
+                    moment, student_id, project_id, student=-STAR_POINTS, project=-1
+                )
+
+    def star_changed(
+        self, project_id: int, student_id: int, starred_at: datetime, delta: int
+    ) -> None:
+        with self._lock:
+            self._apply(
+                starred_at,
+                student_id,
+                project_id,
+                student=STAR_POINTS * delta,
+                project=delta,
+            )
+
+    def top(self, item_type: str, period: str, k: int) -> List[Tuple[int, int, int]]:
+        """Top k (rank, id, score) of the "student" or "project" board of a period."""
+        with self._lock:
+            boards = self._current(period, datetime.utcnow())
+            ranking = boards.students if item_type == "student" else boards.projects
+            return ranking.top(k)
+
+    def student_rank(
+        self, student_id: int, period: str
+    ) -> Tuple[Optional[int], int, int]:
+        """(rank, score, ranked students) of a student; rank is None without a score."""
+        with self._lock:
+            ranking = self._current(period, datetime.utcnow()).students
+            return ranking.rank(student_id), ranking.score(student_id), len(ranking)
+
+
+leaderboards = LeaderboardEngine(refresh_seconds=settings.LEADERBOARD_REFRESH_SECONDS)
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Period:
+    """
+    A half-open time window [start, end). A missing bound is unbounded.
+    Filtering with plain range comparisons (instead of extract()) lets the
+    database use an index range scan on the column.
+    """
+
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    def filter(self, column) -> list:
+        """Returns the predicates restricting `column` to this period, for .filter(*...)."""
+        predicates = []
+        if self.start is not None:
+            predicates.append(column >= self.start)
+        if self.end is not None:
+            predicates.append(column < self.end)
+        return predicates
+
+
+def _add_months(year: int, month: int, months: int) -> datetime:
+    index = year * 12 + (month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def month_period(year: int, month: int) -> Period:
+    """The calendar month `month` of `year`."""
+    return Period(datetime(year, month, 1), _add_months(year, month, 1))
+
+
+def year_period(year: int) -> Period:
+    """The calendar year `year`."""
+    return Period(datetime(year, 1, 1), datetime(year + 1, 1, 1))
+
+
+def all_time() -> Period:
+    return Period()
+
+
+def date_range(start: Optional[datetime], end: Optional[datetime]) -> Period:
+    """An arbitrary window from `start` (inclusive) to `end` (exclusive)."""
+    if start is not None and end is not None and end < start:
+        raise ValueError("Period end must not be before its start")
+    return Period(start, end)
+
+
+def trailing_months(months: int, now: Optional[datetime] = None) -> Period:
+    """The current calendar month and the `months - 1` whole months before it."""
+    now = now or datetime.utcnow()
+    return Period(
+        _add_months(now.year, now.month, 1 - months),
+        _add_months(now.year, now.month, 1),
+    )
+
+
+def current_period(name: str, now: Optional[datetime] = None) -> Period:
+    """Resolves "month", "year" or "all_time" relative to `now` (UTC by default)."""
+    now = now or datetime.utcnow()
+    if name == "month":
+        return month_period(now.year, now.month)
+    if name == "year":
+        return year_period(now.year)
+    if name == "all_time":
+        return all_time()
+    raise ValueError(f"Unknown period: {name}")
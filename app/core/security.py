@@ -1,5 +1,13 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, List, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -10,19 +18,161 @@ from app.core.config import settings  # Import the settings object
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+# --- Password Hashing Executor ---
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing queue is full."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt work on a dedicated, bounded thread pool so that a login spike
+    cannot exhaust the threads used to serve other requests.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+        self._max_wait = 0.0
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Schedules fn(*args), raising PasswordHashingBusy if the queue is full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHashingBusy()
+        with self._lock:
+            self._pending += 1
+        try:
+            return self._executor.submit(self._run, fn, time.perf_counter(), *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+            raise
+
+    def _run(self, fn: Callable, enqueued_at: float, *args):
+        started_at = time.perf_counter()
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.perf_counter()
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._completed += 1
+                self._total_wait += started_at - enqueued_at
+                self._total_run += finished_at - started_at
+                self._max_wait = max(self._max_wait, started_at - enqueued_at)
+            self._slots.release()
+
+    def stats(self) -> dict:
+        """Returns a snapshot of queue depth and latency counters."""
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": (
+                    (self._total_wait / completed * 1000) if completed else 0.0
+                ),
+                "max_wait_ms": self._max_wait * 1000,
+                "avg_hash_ms": (
+                    (self._total_run / completed * 1000) if completed else 0.0
+                ),
+            }
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
+
 # --- Password Functions ---
 
 
+# The sync wrappers block the calling thread until bcrypt finishes; they are for
+# scripts and services. Request handlers await the *_async variants instead.
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed one."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.submit(
+        pwd_context.verify, plain_password, hashed_password
+    ).result()
 
 
 def get_password_hash(password: str) -> str:
     """Hashes a plain password."""
+    return password_hasher.submit(pwd_context.hash, password).result()
+
+
+def _hash_password(password: str) -> str:
+    # Module-level so it can be pickled into the hashing processes.
     return pwd_context.hash(password)
 
 
+_bulk_hash_workers = settings.PASSWORD_HASH_PROCESSES or os.cpu_count() or 1
+_bulk_hash_pool: Optional[ProcessPoolExecutor] = None
+_bulk_hash_pool_lock = threading.Lock()
+
+
+def _get_bulk_hash_pool() -> ProcessPoolExecutor:
+    global _bulk_hash_pool
+    with _bulk_hash_pool_lock:
+        if _bulk_hash_pool is None:
+            _bulk_hash_pool = ProcessPoolExecutor(
+                max_workers=_bulk_hash_workers,
+                # Forking a multi-threaded server process is unsafe; spawn instead.
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _bulk_hash_pool
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Hashes many passwords in parallel across a process pool sized to the CPU count.
+    Results are returned in the same order as the input.
+    """
+    if len(passwords) <= 1:
+        return [get_password_hash(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (_bulk_hash_workers * 4))
+    return list(
+        _get_bulk_hash_pool().map(_hash_password, passwords, chunksize=chunksize)
+    )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a password without holding a request thread while bcrypt runs."""
+    return await asyncio.wrap_future(
+        password_hasher.submit(pwd_context.verify, plain_password, hashed_password)
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hashes a password without holding a request thread while bcrypt runs."""
+    return await asyncio.wrap_future(password_hasher.submit(pwd_context.hash, password))
+
+
 # --- JWT Token Functions ---
 
 
@@ -42,10 +192,61 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+class VerifiedTokenCache:
+    """
+    A bounded, thread-safe LRU of already-verified token payloads.
+    Entries are keyed by the token's SHA-256 digest and expire with the token.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: bytes) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return payload
+
+    def set(self, digest: bytes, expires_at: float, payload: dict) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[digest] = (expires_at, payload)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE)
+
+
 def decode_access_token(token: str) -> Optional[dict]:
-    """Decodes a JWT access token and returns its payload."""
+    """
+    Decodes a JWT access token and returns its payload.
+    Tokens seen before are served from the verified-token cache until they expire.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = verified_tokens.get(digest)
+    if payload is not None:
+        return dict(payload)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        return payload
     except JWTError:
         return None
+    # Only tokens with an expiry are cached, so an entry can never outlive its token
+    if isinstance(payload.get("exp"), (int, float)):
+        verified_tokens.set(digest, payload["exp"], dict(payload))
+    return payload
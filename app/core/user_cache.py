@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+
+class CurrentUser(BaseModel):
+    """
+    A detached snapshot of the authenticated user.
+    Holds only what authorization checks need, so it is safe to share between requests.
+    """
+
+    id: int
+    role: UserRole
+    mobile_number: str
+    lab_id: Optional[int] = None
+    token_version: int = 0
+
+    class Config:
+        frozen = True
+
+
+def snapshot_user(user: User) -> CurrentUser:
+    """Builds a CurrentUser snapshot from a User row (and its teacher profile, if any)."""
+    lab_id = None
+    if user.role in [UserRole.lab_head, UserRole.teacher] and user.teacher_profile:
+        lab_id = user.teacher_profile.lab_id
+    return CurrentUser(
+        id=user.id,
+        role=user.role,
+        mobile_number=user.mobile_number,
+        lab_id=lab_id,
+        token_version=user.token_version or 0,
+    )
+
+
+class UserCache:
+    """
+    A bounded, thread-safe TTL/LRU cache of CurrentUser snapshots keyed by token subject.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, CurrentUser]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, subject: str) -> Optional[CurrentUser]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[subject]
+                return None
+            self._entries.move_to_end(subject)
+            return user
+
+    def set(self, subject: str, user: CurrentUser) -> None:
+        if self.maxsize <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drops every cached snapshot belonging to the given user."""
+        with self._lock:
+            stale = [k for k, (_, u) in self._entries.items() if u.id == user_id]
+            for subject in stale:
+                del self._entries[subject]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE, ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,108 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.config import settings
+
+
+class LazyLoadError(Exception):
+    """Raised in strict mode when a relationship is lazy-loaded."""
+
+
+class QueryStats:
+    """SQL statements executed within one request (or one count_queries block)."""
+
+    def __init__(self, strict_lazy_loads: bool = False):
+        self.strict_lazy_loads = strict_lazy_loads
+        self.count = 0
+        self.total_time = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+
+    @property
+    def total_time_ms(self) -> float:
+        return self.total_time * 1000
+
+    def repeated_statements(
+        self, threshold: int = settings.N_PLUS_ONE_THRESHOLD
+    ) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times: likely N+1 queries."""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def count_queries(strict_lazy_loads: bool = False) -> Iterator[QueryStats]:
+    """
+    Counts the SQL statements executed inside the block.
+    Used per request by the query stats middleware, and directly to assert query budgets:
+
+        with count_queries() as stats:
+            report_service.generate_lab_report(db, cohort_id=1)
+        assert stats.count <= 5
+    """
+    stats = QueryStats(strict_lazy_loads=strict_lazy_loads)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+# The start time lives on the execution context rather than on the connection,
+# so a statement that fails (and never reaches after_cursor_execute) leaves
+# nothing behind to skew the timing of later statements on that connection.
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        context._query_stats_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    start_time = getattr(context, "_query_stats_start", None)
+    if stats is None or start_time is None:
+        return
+    stats.record(statement, time.perf_counter() - start_time)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _check_lazy_load(orm_execute_state: ORMExecuteState) -> None:
+    stats = _current_stats.get()
+    if (
+        stats is not None
+        and stats.strict_lazy_loads
+        and orm_execute_state.is_select
+        and orm_execute_state.lazy_loaded_from is not None
+    ):
+        path = orm_execute_state.loader_strategy_path
+        attribute = path[-1] if path else orm_execute_state.lazy_loaded_from.class_
+        raise LazyLoadError(
+            f"Lazy load of {attribute} during a strict request; "
+            "load the relationship eagerly (joinedload/selectinload)."
+        )
@@ -0,0 +1,54 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+
+class RecentWriters:
+    """
+    Remembers which users committed a write in the last few seconds, so their
+    reads can stay on the primary until the replica has caught up.
+    """
+
+    def __init__(self, window_seconds: int):
+        self.window_seconds = window_seconds
+        self._deadlines: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: int) -> None:
+        if self.window_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._deadlines[user_id] = now + self.window_seconds
+            # Prune lazily so the map only holds users inside their window.
+            if len(self._deadlines) > 1024:
+                self._deadlines = {
+                    uid: deadline
+                    for uid, deadline in self._deadlines.items()
+                    if deadline > now
+                }
+
+    def is_recent(self, user_id: int) -> bool:
+        with self._lock:
+            deadline = self._deadlines.get(user_id)
+            if deadline is None:
+                return False
+            if deadline <= time.monotonic():
+                del self._deadlines[user_id]
+                return False
+            return True
+
+
+recent_writers = RecentWriters(window_seconds=settings.READ_YOUR_WRITES_SECONDS)
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session: Session) -> None:
+    # get_current_user tags the request's primary session with the user's id.
+    user_id = session.info.get("user_id")
+    if user_id is not None:
+        recent_writers.mark(user_id)
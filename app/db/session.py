@@ -1,6 +1,77 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+engine = create_engine(
+    settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **POOL_OPTIONS
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly.
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def get_async_database_url(
+    database_url: str | None = settings.DATABASE_URL,
+    async_database_url: str | None = settings.ASYNC_DATABASE_URL,
+) -> str | None:
+    """Returns the async database URL, derived from the sync URL if not configured."""
+    if async_database_url:
+        return async_database_url
+    if not database_url:
+        return None
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        return None
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _create_async_engine(url: str | None):
+    if not url:
+        return None
+    return create_async_engine(
+        url, poolclass=InstrumentedAsyncAdaptedQueuePool, **POOL_OPTIONS
+    )
+
+
+def _async_sessionmaker(bind):
+    if bind is None:
+        return None
+    return async_sessionmaker(bind, autoflush=False, expire_on_commit=False)
+
+
+async_database_url = get_async_database_url()
+async_engine = _create_async_engine(async_database_url)
+AsyncSessionLocal = _async_sessionmaker(async_engine)
+
+# Read replica. Without REPLICA_DATABASE_URL every read goes to the primary.
+replica_engine = (
+    create_engine(
+        settings.REPLICA_DATABASE_URL, poolclass=InstrumentedQueuePool, **POOL_OPTIONS
+    )
+    if settings.REPLICA_DATABASE_URL
+    else None
+)
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine
+    else None
+)
+async_replica_engine = _create_async_engine(
+    get_async_database_url(
+        settings.REPLICA_DATABASE_URL, settings.ASYNC_REPLICA_DATABASE_URL
+    )
+)
+AsyncReplicaSessionLocal = _async_sessionmaker(async_replica_engine)
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DB_DIR = os.path.join(_APP_DIR, "db")
+
+
+def _call_site() -> Optional[str]:
+    """The innermost application frame (outside app/db) that issued the statement."""
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if filename.startswith(_APP_DIR) and not filename.startswith(_DB_DIR):
+            path = os.path.relpath(filename, os.path.dirname(_APP_DIR))
+            return f"{path}:{frame.lineno} in {frame.name}"
+    return None
+
+
+def _explain(connection, dialect_name: str, statement: str, parameters) -> List[str]:
+    """Runs EXPLAIN (EXPLAIN QUERY PLAN on SQLite) on a raw cursor of the connection."""
+    prefix = "EXPLAIN QUERY PLAN " if dialect_name == "sqlite" else "EXPLAIN "
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [" | ".join(str(col) for col in row) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+class SlowQueryEntry:
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_parameters: Optional[str] = None
+        self.call_site: Optional[str] = None
+        self.plan: Optional[List[str]] = None
+        self.plan_requested = False
+
+    def as_dict(self) -> dict:
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "last_parameters": self.last_parameters,
+            "call_site": self.call_site,
+            "plan": self.plan,
+        }
+
+
+class SlowQueryLog:
+    """
+    Aggregates statements slower than the threshold, keyed by statement text.
+    The statements with the highest total time get their query plan captured once.
+    """
+
+    def __init__(self, threshold_ms: int, max_entries: int, explain_top: int):
+        self.threshold_ms = threshold_ms
+        self.max_entries = max_entries
+        self.explain_top = explain_top
+        self._entries: dict[str, SlowQueryEntry] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self, statement: str, parameters, elapsed_ms: float
+    ) -> Optional[SlowQueryEntry]:
+        """Records a slow execution. Returns the entry if its plan should be captured."""
+        call_site = _call_site()
+        with self._lock:
+            entry = self._entries.get(statement)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    # Make room by dropping the statement with the least total time.
+                    least = min(self._entries.values(), key=lambda e: e.total_ms)
+                    del self._entries[least.statement]
+                entry = self._entries[statement] = SlowQueryEntry(statement)
+            entry.count += 1
+            entry.total_ms += elapsed_ms
+            entry.max_ms = max(entry.max_ms, elapsed_ms)
+            entry.last_parameters = repr(parameters)[:500]
+            entry.call_site = call_site
+            if (
+                entry.plan is not None
+                or entry.plan_requested
+                or not self._is_worst(entry)
+            ):
+                return None
+            entry.plan_requested = True
+            return entry
+
+    def _is_worst(self, entry: SlowQueryEntry) -> bool:
+        heavier = sum(1 for e in self._entries.values() if e.total_ms > entry.total_ms)
+        return heavier < self.explain_top
+
+    def top(self, limit: int) -> List[dict]:
+        with self._lock:
+            entries = sorted(
+                self._entries.values(), key=lambda e: e.total_ms, reverse=True
+            )
+            return [entry.as_dict() for entry in entries[:limit]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class PlanCapture:
+    """
+    Captures query plans off the request path, on a separate pooled connection
+    and never inside the caller's transaction. Sync engines are served by a
+    background thread; async engines by a task on the caller's event loop, since
+    their connections are bound to it. Requests beyond max_pending are dropped.
+    """
+
+    def __init__(self, max_pending: int):
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._tasks: set = set()
+
+    def submit(
+        self, engine: Engine, entry: SlowQueryEntry, statement: str, parameters
+    ) -> None:
+        request = (engine, entry, statement, parameters)
+        if engine.dialect.is_async:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                entry.plan_requested = False
+                return
+            task = loop.create_task(self._capture_async(*request))
+            self._tasks.add(task)  # Keep a reference until the task is done
+            task.add_done_callback(self._tasks.discard)
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            entry.plan_requested = False
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._work, name="slow-query-explain", daemon=True
+                )
+                self._thread.start()
+
+    def _work(self) -> None:
+        while True:
+            self._capture(*self._queue.get())
+
+    def _capture(
+        self, engine: Engine, entry: SlowQueryEntry, statement: str, parameters
+    ) -> None:
+        try:
+            with engine.connect() as conn:
+                entry.plan = _explain(conn, engine.dialect.name, statement, parameters)
+        except Exception:
+            entry.plan_requested = False
+            logger.exception("Could not capture the plan of a slow query")
+
+    async def _capture_async(
+        self, engine: Engine, entry: SlowQueryEntry, statement: str, parameters
+    ) -> None:
+        try:
+            async with AsyncEngine(engine).connect() as conn:
+                entry.plan = await conn.run_sync(
+                    _explain, engine.dialect.name, statement, parameters
+                )
+        except Exception:
+            entry.plan_requested = False
+            logger.exception("Could not capture the plan of a slow query")
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    max_entries=settings.SLOW_QUERY_MAX_ENTRIES,
+    explain_top=settings.SLOW_QUERY_EXPLAIN_TOP,
+)
+plan_capture = PlanCapture(max_pending=settings.SLOW_QUERY_EXPLAIN_TOP)
+
+
+# Start times live on the execution context, so a failed statement leaves
+# nothing behind on the pooled connection.
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        context._slow_query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_time = getattr(context, "_slow_query_start", None)
+    if start_time is None:
+        return
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    if elapsed_ms < slow_query_log.threshold_ms:
+        return
+
+    logger.warning("Slow query (%.1f ms): %s", elapsed_ms, " ".join(statement.split()))
+    entry = slow_query_log.record(statement, parameters, elapsed_ms)
+    if entry is None:
+        return
+    # Only reads are explained; plain EXPLAIN (no ANALYZE) plans without executing.
+    if executemany or not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        entry.plan_requested = False
+        return
+    plan_capture.submit(conn.engine, entry, statement, parameters)
@@ -0,0 +1,19 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Dialects whose INSERT supports ON CONFLICT (on_conflict_do_nothing / _do_update).
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def dialect_insert(db: Session, table):
+    """
+    Returns an INSERT construct for the session's database that supports
+    ON CONFLICT clauses. Raises NotImplementedError for other databases.
+    """
+    dialect_name = db.get_bind().dialect.name
+    insert = _INSERTS.get(dialect_name)
+    if insert is None:
+        raise NotImplementedError(
+            f"ON CONFLICT inserts are not supported on {dialect_name}"
+        )
+    return insert(table)
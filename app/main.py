@@ -1,6 +1,16 @@
-from fastapi import FastAPI
+import logging
+
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.api.v1.api import api_router
+from app.core.config import settings
+from app.core.security import PasswordHashingBusy
+from app.db.query_stats import count_queries
+from app.services.leaderboard_service import refresh_leaderboards
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Lab Management System API", openapi_url="/api/v1/openapi.json")
 
@@ -15,6 +25,64 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly."},
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
+@app.on_event("startup")
+async def warm_leaderboards():
+    """
+    Builds the in-memory leaderboards before the first request needs them.
+    A failure (e.g. the database is not reachable yet) does not abort startup:
+    the boards stay stale and the first leaderboard read rebuilds them.
+    """
+    if settings.LEADERBOARD_IN_MEMORY:
+        try:
+            await run_in_threadpool(refresh_leaderboards)
+        except Exception:
+            logger.exception("Could not warm the leaderboards; they load on first use")
+
+
+@app.middleware("http")
+async def query_stats_middleware(request: Request, call_next):
+    """
+    Counts SQL statements and DB time per request and reports them in the
+    X-DB-Query-Count / X-DB-Query-Time-Ms headers. Repeated identical statements
+    are logged as N+1 candidates.
+    """
+    if not settings.QUERY_STATS_ENABLED:
+        return await call_next(request)
+    with count_queries(strict_lazy_loads=settings.STRICT_LAZY_LOADS) as stats:
+        response = await call_next(request)
+    response.headers["X-DB-Query-Count"] = str(stats.count)
+    response.headers["X-DB-Query-Time-Ms"] = f"{stats.total_time_ms:.1f}"
+
+    repeated = stats.repeated_statements()
+    if repeated:
+        response.headers["X-DB-N-Plus-One"] = str(len(repeated))
+        for statement, count in repeated:
+            logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times: %s",
+                request.method,
+                request.url.path,
+                count,
+                " ".join(statement.split())[:300],
+            )
+    logger.info(
+        "%s %s: %d queries in %.1f ms",
+        request.method,
+        request.url.path,
+        stats.count,
+        stats.total_time_ms,
+    )
+    return response
+
+
 app.include_router(api_router, prefix="/api/v1")
 
 
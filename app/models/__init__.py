@@ -8,3 +8,4 @@ from .user import User, TeacherProfile, TeacherSkill, StudentProfile
 from .enrollment import EnrollmentCohort, StudentEnrollment, CohortTeacher
 from .project import Project, ProjectStar
 from .mark import Mark
+from .refresh_token import RefreshToken
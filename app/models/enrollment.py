@@ -1,5 +1,13 @@
 import enum
-from sqlalchemy import Column, Integer, String, Date, Enum as SQLAlchemyEnum, ForeignKey
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Date,
+    Enum as SQLAlchemyEnum,
+    ForeignKey,
+    Index,
+)
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -23,6 +31,9 @@ class EnrollmentCohort(Base):
     """
 
     __tablename__ = "enrollment_cohorts"
+    __table_args__ = (
+        Index("ix_enrollment_cohorts_lab_id_section", "lab_id", "section"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     lab_id = Column(Integer, ForeignKey("labs.id"), nullable=False)
@@ -55,6 +66,16 @@ class StudentEnrollment(Base):
     """
 
     __tablename__ = "student_enrollments"
+    __table_args__ = (
+        # A student is enrolled in a cohort at most once
+        Index(
+            "uq_student_enrollments_cohort_id_student_user_id",
+            "cohort_id",
+            "student_user_id",
+            unique=True,
+        ),
+        Index("ix_student_enrollments_student_user_id", "student_user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -73,6 +94,15 @@ class CohortTeacher(Base):
     """
 
     __tablename__ = "cohort_teachers"
+    __table_args__ = (
+        # A teacher is assigned to a cohort at most once
+        Index(
+            "uq_cohort_teachers_cohort_id_teacher_user_id",
+            "cohort_id",
+            "teacher_user_id",
+            unique=True,
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     teacher_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
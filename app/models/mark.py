@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, DECIMAL
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, DECIMAL, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -10,6 +10,9 @@ class Mark(Base):
     """
 
     __tablename__ = "marks"
+    __table_args__ = (
+        Index("ix_marks_enrollment_id_date_recorded", "enrollment_id", "date_recorded"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     enrollment_id = Column(
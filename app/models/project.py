@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -10,6 +10,11 @@ class Project(Base):
     """
 
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_cohort_id_submission_date", "cohort_id", "submission_date"),
+        Index("ix_projects_student_user_id", "student_user_id"),
+        Index("ix_projects_star_count", "star_count"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -19,6 +24,8 @@ class Project(Base):
     video_links = Column(JSON, nullable=True)
     photo_urls = Column(JSON, nullable=True)
     submission_date = Column(DateTime, nullable=False, server_default=func.now())
+    # Denormalized count of project_stars rows, kept in step by project_service
+    star_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     student = relationship("User", back_populates="projects_submitted")
     cohort = relationship("EnrollmentCohort", back_populates="projects")
@@ -33,6 +40,16 @@ class ProjectStar(Base):
     """
 
     __tablename__ = "project_stars"
+    __table_args__ = (
+        # A user stars a project at most once
+        Index(
+            "uq_project_stars_project_id_user_id",
+            "project_id",
+            "user_id",
+            unique=True,
+        ),
+        Index("ix_project_stars_starred_at", "starred_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
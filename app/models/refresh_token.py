@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+
+
+class RefreshToken(Base):
+    """
+    A rotating refresh token. Only the SHA-256 digest of the token is stored.
+    revoked_reason tells a token replaced by rotation (whose reuse signals theft)
+    apart from one ended by logout or a bulk revocation.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    ROTATED = "rotated"
+    LOGGED_OUT = "logout"
+    REVOKED = "revoked"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    revoked_reason = Column(String(16), nullable=True)
+
+    user = relationship("User", back_populates="refresh_tokens")
@@ -44,6 +44,9 @@ class User(Base):
     date_of_birth = Column(Date, nullable=True)
     gender = Column(String, nullable=True)
     address = Column(Text, nullable=True)
+    # Bumped when the user's role or mobile number changes, their lab is deleted,
+    # or their password is changed or reset, revoking issued tokens
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     # One-to-one relationships
     teacher_profile = relationship(
@@ -68,6 +71,9 @@ class User(Base):
     enrollments = relationship("StudentEnrollment", back_populates="student")
     cohorts_created = relationship("EnrollmentCohort", back_populates="creator")
     cohorts_taught = relationship("CohortTeacher", back_populates="teacher")
+    refresh_tokens = relationship(
+        "RefreshToken", back_populates="user", cascade="all, delete-orphan"
+    )
 
 
 class TeacherProfile(Base):
@@ -78,7 +84,7 @@ class TeacherProfile(Base):
     __tablename__ = "teacher_profiles"
 
     user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
-    lab_id = Column(Integer, ForeignKey("labs.id"), nullable=True)
+    lab_id = Column(Integer, ForeignKey("labs.id"), nullable=True, index=True)
     photo_url = Column(String, nullable=True)
     bio = Column(Text, nullable=True)
     date_of_joining = Column(Date, nullable=True)
@@ -1,13 +1,24 @@
 from pydantic import BaseModel
 
+from app.models.user import UserRole
+
 
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenData(BaseModel):
     mobile_number: str | None = None
+    user_id: int | None = None
+    role: UserRole | None = None
+    lab_id: int | None = None
+    token_version: int | None = None
 
 
 class UserLogin(BaseModel):
@@ -29,6 +29,40 @@ class StudentEnrollmentCreate(BaseModel):
     student_user_ids: List[int]
 
 
+# --- Schemas for Bulk Enrollment ---
+# A matrix of cohorts and the students to enroll in each.
+class CohortEnrollmentBatch(BaseModel):
+    cohort_id: int
+    student_user_ids: List[int]
+
+
+class BulkEnrollmentCreate(BaseModel):
+    enrollments: List[CohortEnrollmentBatch]
+
+
+class CohortEnrollmentCount(BaseModel):
+    cohort_id: int
+    enrolled: int
+    already_enrolled: int
+
+
+class BulkEnrollmentResult(BaseModel):
+    enrolled: int
+    already_enrolled: int
+    cohorts: List[CohortEnrollmentCount]
+
+
+# --- Schemas for Roster Sync ---
+class CohortRosterUpdate(BaseModel):
+    student_user_ids: List[int]
+
+
+class RosterSyncResult(BaseModel):
+    enrolled: int
+    unenrolled: int
+    unchanged: int
+
+
 class EnrollmentCohortUpdate(BaseModel):
     academic_year: Optional[int] = None
     section: Optional[LabSection] = None
@@ -27,3 +27,11 @@ class LeaderboardProjectEntry(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Schema for a single student's position on a leaderboard.
+class LeaderboardRank(BaseModel):
+    student_id: int
+    rank: Optional[int] = None
+    score: int
+    ranked_students: int
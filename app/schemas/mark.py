@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import date
 
 
@@ -26,3 +26,34 @@ class MarkUpdate(BaseModel):
     assessment_name: Optional[str] = None
     marks_obtained: Optional[float] = None
     total_marks: Optional[float] = None
+
+
+# --- Schemas for Batch Updates ---
+# Maximum number of marks changed by one batch request.
+MARKS_BATCH_MAX_UPDATES = 500
+
+
+class MarkBatchUpdateItem(MarkUpdate):
+    id: int
+
+
+class MarkBatchUpdate(BaseModel):
+    marks: List[MarkBatchUpdateItem] = Field(
+        ..., min_length=1, max_length=MARKS_BATCH_MAX_UPDATES
+    )
+
+
+class MarkBatchUpdateResult(BaseModel):
+    updated: int
+
+
+# --- Schemas for CSV Import ---
+class MarkImportError(BaseModel):
+    line: int
+    error: str
+
+
+class MarksImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[MarkImportError]
@@ -0,0 +1,76 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class PasswordHashingStats(BaseModel):
+    """Queue depth and latency counters for the password hashing executor."""
+
+    workers: int
+    max_queue: int
+    running: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    avg_wait_ms: float
+    max_wait_ms: float
+    avg_hash_ms: float
+
+
+class PoolStats(BaseModel):
+    """Usage counters for a single connection pool."""
+
+    size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class DatabasePoolStats(BaseModel):
+    """Connection pool usage for the primary and (if configured) replica engines."""
+
+    sync_pool: Optional[PoolStats] = None
+    async_pool: Optional[PoolStats] = None
+    replica_pool: Optional[PoolStats] = None
+    async_replica_pool: Optional[PoolStats] = None
+
+
+class SlowQuery(BaseModel):
+    """A statement that exceeded the slow-query threshold, aggregated over its runs."""
+
+    statement: str
+    count: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+    last_parameters: Optional[str] = None
+    call_site: Optional[str] = None
+    plan: Optional[List[str]] = None
+
+
+class DashboardSectionTiming(BaseModel):
+    """Latency of one lab dashboard section, aggregated over requests."""
+
+    section: str
+    count: int
+    avg_ms: float
+    max_ms: float
+
+
+class LabDashboardCacheStats(BaseModel):
+    """Effectiveness of the per-lab dashboard cache."""
+
+    size: int
+    max_size: int
+    ttl_seconds: int
+    hits: int
+    misses: int
+    invalidations: int
+    hit_ratio: float
+    avg_compute_ms: float
+    compute_ms_saved: float
+    queries_saved: int
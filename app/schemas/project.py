@@ -36,3 +36,15 @@ class ProjectUpdate(BaseModel):
     description: Optional[str] = None
     video_links: Optional[List[str]] = None
     photo_urls: Optional[List[str]] = None
+
+
+# --- Schemas for Starring ---
+# Without a desired state the star is toggled; with one, the request is idempotent.
+class ProjectStarUpdate(BaseModel):
+    starred: Optional[bool] = None
+
+
+class ProjectStarStatus(BaseModel):
+    message: str
+    starred: bool
+    star_count: int
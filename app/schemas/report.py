@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 from .teacher import Teacher  # Reuse existing detailed schemas
 from .student import Student
@@ -31,3 +31,6 @@ class TopStudentReport(BaseModel):
     month: int
     year: int
     report: List[TopStudentEntry]
+    # Cursor for the next page; both are None on the last page
+    next_after_rank: Optional[int] = None
+    next_after_student_id: Optional[int] = None
@@ -1,102 +1,146 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, extract
-from datetime import datetime
+from sqlalchemy import Integer, String, cast, func, literal, null, select, union_all
 
-from app.models import School, Lab, User, Project, ProjectStar
+from app.core.leaderboards import PROJECT_POINTS, STAR_POINTS
+from app.core.periods import current_period
+from app.models import School, Lab, User, Project, ProjectStar, EnrollmentCohort
 from app.models.user import UserRole
 
 
+def _count_scalar(column, *criteria):
+    return select(func.count(column)).where(*criteria).scalar_subquery()
+
+
 def get_admin_dashboard_stats(db: Session):
     """
     Efficiently calculates all statistics for the admin dashboard on the server.
+    Two round trips: one statement for all counts (as scalar subqueries) and one
+    UNION ALL for the school rankings and the recent activity feed.
     """
-    now = datetime.utcnow()
-    current_month = now.month
-    current_year = now.year
+    this_month = current_period("month")
 
-    # --- Core Counts ---
-    schools_count = db.query(func.count(School.id)).scalar() or 0
-    labs_count = db.query(func.count(Lab.id)).scalar() or 0
-    teachers_count = (
-        db.query(func.count(User.id))
-        .filter(User.role.in_([UserRole.teacher, UserRole.lab_head]))
-        .scalar()
-        or 0
-    )
-    students_count = (
-        db.query(func.count(User.id)).filter(User.role == UserRole.student).scalar()
-        or 0
-    )
+    # --- Core and Monthly Counts ---
+    counts = db.execute(
+        select(
+            _count_scalar(School.id).label("schools"),
+            _count_scalar(Lab.id).label("labs"),
+            _count_scalar(
+                User.id, User.role.in_([UserRole.teacher, UserRole.lab_head])
+            ).label("teachers"),
+            _count_scalar(User.id, User.role == UserRole.student).label("students"),
+            _count_scalar(Project.id).label("projects"),
+            _count_scalar(
+                Project.id, *this_month.filter(Project.submission_date)
+            ).label("projects_this_month"),
+            _count_scalar(
+                ProjectStar.id, *this_month.filter(ProjectStar.starred_at)
+            ).label("stars_this_month"),
+        )
+    ).one()
 
-    # --- Monthly Stats ---
-    projects_this_month = (
-        db.query(func.count(Project.id))
-        .filter(
-            extract("year", Project.submission_date) == current_year,
-            extract("month", Project.submission_date) == current_month,
+    # --- School Rankings ---
+    # Projects and stars are totalled per lab first; stars come from the
+    # denormalized star_count, so there is no join fan-out to de-duplicate.
+    lab_totals = (
+        select(
+            EnrollmentCohort.lab_id,
+            func.count(Project.id).label("projects"),
+            func.sum(Project.star_count).label("stars"),
         )
-        .scalar()
-        or 0
+        .join(Project, Project.cohort_id == EnrollmentCohort.id)
+        .group_by(EnrollmentCohort.lab_id)
+        .subquery()
     )
-
-    stars_this_month = (
-        db.query(func.count(ProjectStar.id))
-        .filter(
-            extract("year", ProjectStar.starred_at) == current_year,
-            extract("month", ProjectStar.starred_at) == current_month,
+    school_projects = func.coalesce(func.sum(lab_totals.c.projects), 0)
+    school_stars = func.coalesce(func.sum(lab_totals.c.stars), 0)
+    school_score = school_projects * PROJECT_POINTS + school_stars * STAR_POINTS
+    school_rankings = (
+        select(
+            literal("school").label("kind"),
+            func.row_number()
+            .over(order_by=(school_score.desc(), School.id))
+            .label("position"),
+            School.name.label("name"),
+            cast(null(), String).label("role"),
+            school_projects.label("projects"),
+            school_stars.label("stars"),
         )
-        .scalar()
-        or 0
+        .outerjoin(Lab, Lab.school_id == School.id)
+        .outerjoin(lab_totals, lab_totals.c.lab_id == Lab.id)
+        .group_by(School.id, School.name)
+        .order_by(school_score.desc(), School.id)
+        .limit(5)
+        .subquery()
     )
 
-    # --- School Rankings ---
-    school_ranking_query = (
-        db.query(
-            School.name,
-            func.count(func.distinct(Project.id)).label("project_count"),
-            func.count(ProjectStar.id).label("star_count"),
+    # --- Recent Activities ---
+    recent_projects = (
+        select(
+            literal("project").label("kind"),
+            func.row_number()
+            .over(order_by=(Project.submission_date.desc(), Project.id.desc()))
+            .label("position"),
+            Project.project_name.label("name"),
+            cast(null(), String).label("role"),
+            cast(null(), Integer).label("projects"),
+            cast(null(), Integer).label("stars"),
         )
-        .select_from(School)
-        .outerjoin(Lab)
-        .outerjoin(Project, Project.cohort.has(lab_id=Lab.id))
-        .outerjoin(ProjectStar, Project.id == ProjectStar.project_id)
-        .group_by(School.id)
-        .all()
+        .order_by(Project.submission_date.desc(), Project.id.desc())
+        .limit(3)
+        .subquery()
     )
-
-    school_rankings = []
-    for name, p_count, s_count in school_ranking_query:
-        score = (p_count * 10) + (s_count * 2)
-        school_rankings.append(
-            {"name": name, "projects": p_count, "stars": s_count, "score": score}
+    recent_users = (
+        select(
+            literal("user").label("kind"),
+            func.row_number().over(order_by=User.id.desc()).label("position"),
+            User.name.label("name"),
+            cast(User.role, String).label("role"),
+            cast(null(), Integer).label("projects"),
+            cast(null(), Integer).label("stars"),
         )
+        .order_by(User.id.desc())
+        .limit(3)
+        .subquery()
+    )
 
-    school_rankings.sort(key=lambda x: x["score"], reverse=True)
+    feed = db.execute(
+        union_all(
+            select(school_rankings),
+            select(recent_projects),
+            select(recent_users),
+        )
+    ).all()
+    feed = sorted(feed, key=lambda row: (row.kind, row.position))
 
-    # --- Recent Activities ---
-    recent_projects = (
-        db.query(Project).order_by(desc(Project.submission_date)).limit(3).all()
-    )
-    recent_users = db.query(User).order_by(desc(User.id)).limit(3).all()
+    rankings = [
+        {
+            "name": row.name,
+            "projects": row.projects,
+            "stars": row.stars,
+            "score": (row.projects * PROJECT_POINTS) + (row.stars * STAR_POINTS),
+        }
+        for row in feed
+        if row.kind == "school"
+    ]
 
     activities = []
-    for project in recent_projects:
-        activities.append(f"New project '{project.project_name}' submitted.")
-    for user in recent_users:
-        activities.append(f"User '{user.name}' ({user.role.value}) registered.")
+    for row in feed:
+        if row.kind == "project":
+            activities.append(f"New project '{row.name}' submitted.")
+    for row in feed:
+        if row.kind == "user":
+            activities.append(f"User '{row.name}' ({row.role}) registered.")
 
     return {
-        "schools": schools_count,
-        "labs": labs_count,
-        "teachers": teachers_count,
-        "students": students_count,
-        "projects_this_month": projects_this_month,
-        "stars_this_month": stars_this_month,
+        "schools": counts.schools,
+        "labs": counts.labs,
+        "teachers": counts.teachers,
+        "students": counts.students,
+        "projects_this_month": counts.projects_this_month,
+        "stars_this_month": counts.stars_this_month,
         "avg_projects_per_school": (
-            (db.query(func.count(Project.id)).scalar() or 0) / schools_count
-            if schools_count > 0
-            else 0
+            counts.projects / counts.schools if counts.schools > 0 else 0
         ),
-        "school_rankings": school_rankings[:5],
+        "school_rankings": rankings,
         "recent_activities": activities[:5],
     }
@@ -1,7 +1,7 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Project, ProjectStar, User
+from app.models import Project
 from app.schemas.dashboard_project import ProjectDashboardStats
 from app.schemas.project import Project as ProjectSchema
 
@@ -12,17 +12,16 @@ def get_project_dashboard_stats(db: Session) -> ProjectDashboardStats:
     """
     # 1. Top Rated Projects (Top 10 by stars)
     top_rated_query = (
-        db.query(Project, func.count(ProjectStar.id).label("star_count"))
-        .outerjoin(Project.stars)
+        db.query(Project)
         .join(Project.student)
-        .group_by(Project.id, User.id)
-        .order_by(func.count(ProjectStar.id).desc())
+        .options(contains_eager(Project.student))
+        .order_by(Project.star_count.desc())
         .limit(10)
         .all()
     )
 
     top_rated_list = []
-    for p, star_count in top_rated_query:
+    for p in top_rated_query:
         top_rated_list.append(
             ProjectSchema(
                 id=p.id,
@@ -32,23 +31,22 @@ def get_project_dashboard_stats(db: Session) -> ProjectDashboardStats:
                 photo_urls=p.photo_urls,
                 submission_date=p.submission_date,
                 author=p.student,
-                star_count=star_count,
+                star_count=p.star_count,
             )
         )
 
     # 2. Most Recent Projects (Top 10)
     most_recent_query = (
-        db.query(Project, func.count(ProjectStar.id).label("star_count"))
-        .outerjoin(Project.stars)
+        db.query(Project)
         .join(Project.student)
-        .group_by(Project.id, User.id)
+        .options(contains_eager(Project.student))
         .order_by(Project.submission_date.desc())
         .limit(10)
         .all()
     )
 
     most_recent_list = []
-    for p, star_count in most_recent_query:
+    for p in most_recent_query:
         most_recent_list.append(
             ProjectSchema(
                 id=p.id,
@@ -58,10 +56,15 @@ def get_project_dashboard_stats(db: Session) -> ProjectDashboardStats:
                 photo_urls=p.photo_urls,
                 submission_date=p.submission_date,
                 author=p.student,
-                star_count=star_count,
+                star_count=p.star_count,
             )
         )
 
     return ProjectDashboardStats(
         top_rated_projects=top_rated_list, most_recent_projects=most_recent_list
     )
+
+
+async def get_project_dashboard_stats_async(db: AsyncSession) -> ProjectDashboardStats:
+    """Async variant of get_project_dashboard_stats for the async engine."""
+    return await db.run_sync(get_project_dashboard_stats)
@@ -1,7 +1,16 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, extract
-from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func
 
+from app.core.config import settings
+from app.core.dashboard_cache import lab_dashboard_cache
+from app.core.periods import trailing_months
+from app.db.session import async_replica_engine
 from app.schemas.dashboard import (
     KPIStats,
     LabDashboardStats,
@@ -22,50 +31,48 @@ from app.models import (
 from app.models.user import UserRole, PerformanceStatus
 from app.models.enrollment import LabSection
 
+# --- 1. KPI Calculations ---
 
-def get_lab_dashboard_stats(db: Session, lab_id: int) -> LabDashboardStats:
-    """
-    Computes and returns all statistics for the lab dashboard.
-    """
-    # --- 1. KPI Calculations ---
 
-    total_students = (
+def _total_students(db: Session, lab_id: int) -> int:
+    return (
         db.query(func.count(StudentEnrollment.student_user_id.distinct()))
         .join(EnrollmentCohort)
         .filter(EnrollmentCohort.lab_id == lab_id)
         .scalar()
-    )
+    ) or 0
+
 
-    total_teachers = (
+def _total_teachers(db: Session, lab_id: int) -> int:
+    return (
         db.query(func.count(TeacherProfile.user_id))
         .filter(TeacherProfile.lab_id == lab_id)
         .scalar()
-    )
+    ) or 0
+
 
-    total_projects = (
+def _total_projects(db: Session, lab_id: int) -> int:
+    return (
         db.query(func.count(Project.id))
         .join(EnrollmentCohort)
         .filter(EnrollmentCohort.lab_id == lab_id)
         .scalar()
-    )
+    ) or 0
 
-    total_stars = (
-        db.query(func.count(ProjectStar.id))
-        .join(Project)
+
+def _total_stars(db: Session, lab_id: int) -> int:
+    return (
+        db.query(func.sum(Project.star_count))
         .join(EnrollmentCohort)
         .filter(EnrollmentCohort.lab_id == lab_id)
         .scalar()
-    )
+    ) or 0
 
-    kpis = KPIStats(
-        total_students=total_students or 0,
-        total_teachers=total_teachers or 0,
-        total_projects=total_projects or 0,
-        total_stars=total_stars or 0,
-    )
 
-    # --- 2. Data for Charts ---
+# --- 2. Data for Charts ---
 
+
+def _student_distribution(db: Session, lab_id: int) -> List[ChartDataPoint]:
     student_dist_query = (
         db.query(
             EnrollmentCohort.section,
@@ -76,10 +83,12 @@ def get_lab_dashboard_stats(db: Session, lab_id: int) -> LabDashboardStats:
         .group_by(EnrollmentCohort.section)
         .all()
     )
-    student_distribution = [
+    return [
         ChartDataPoint(name=row[0].value, value=row[1]) for row in student_dist_query
     ]
 
+
+def _grok_specialization(db: Session, lab_id: int) -> List[ChartDataPoint]:
     # This query correctly filters for GROK sections. If it returns an empty array,
     # it means no students are currently enrolled in a GROK cohort for this lab.
     grok_spec_query = (
@@ -95,12 +104,14 @@ def get_lab_dashboard_stats(db: Session, lab_id: int) -> LabDashboardStats:
         .group_by(EnrollmentCohort.grok_specialization)
         .all()
     )
-    grok_specialization = [
+    return [
         ChartDataPoint(name=row[0].value, value=row[1])
         for row in grok_spec_query
         if row[0]
     ]
 
+
+def _performance_distribution(db: Session, lab_id: int) -> List[ChartDataPoint]:
     # FIX: The original query was too complex. This revised approach is more reliable.
     # 1. Get all unique student IDs in the lab.
     students_in_lab_subquery = (
@@ -118,14 +129,19 @@ def get_lab_dashboard_stats(db: Session, lab_id: int) -> LabDashboardStats:
         .all()
     )
 
-    performance_distribution = [
+    return [
         ChartDataPoint(name=row[0].value, value=row[1])
         for row in perf_dist_query
         if row[0]
     ]
 
-    # --- 3. Project Submission Trend (Last 12 months) ---
-    twelve_months_ago = datetime.utcnow() - timedelta(days=365)
+
+# --- 3. Project Submission Trend (Last 12 months) ---
+
+
+def _project_trend(db: Session, lab_id: int) -> List[TrendDataPoint]:
+    # Whole calendar months, so the oldest bucket is not a partial month
+    last_twelve_months = trailing_months(12)
     project_trend_query = (
         db.query(
             func.to_char(Project.submission_date, "YYYY-MM").label("month"),
@@ -134,18 +150,21 @@ def get_lab_dashboard_stats(db: Session, lab_id: int) -> LabDashboardStats:
         .join(EnrollmentCohort)
         .filter(
             EnrollmentCohort.lab_id == lab_id,
-            Project.submission_date >= twelve_months_ago,
+            *last_twelve_months.filter(Project.submission_date),
         )
         .group_by("month")
         .order_by("month")
         .all()
     )
-    project_trend = [
+    return [
         TrendDataPoint(month=row.month, count=row.count) for row in project_trend_query
     ]
 
-    # --- 4. Leaderboards (Top 5) ---
 
+# --- 4. Leaderboards (Top 5) ---
+
+
+def _top_students(db: Session, lab_id: int) -> List[TopStudent]:
     top_students_query = (
         db.query(
             User.id,
@@ -167,7 +186,7 @@ def get_lab_dashboard_stats(db: Session, lab_id: int) -> LabDashboardStats:
         .all()
     )
 
-    top_students = [
+    return [
         TopStudent(
             student_id=row[0],
             student_name=row[1],
@@ -177,24 +196,24 @@ def get_lab_dashboard_stats(db: Session, lab_id: int) -> LabDashboardStats:
         for row in top_students_query
     ]
 
+
+def _top_projects(db: Session, lab_id: int) -> List[TopProject]:
     top_projects_query = (
         db.query(
             Project.id,
             Project.project_name,
             (User.name + " " + User.last_name).label("student_name"),
-            func.count(ProjectStar.id).label("star_count"),
+            Project.star_count,
         )
         .join(Project.cohort)
         .join(Project.student)
-        .outerjoin(Project.stars)
         .filter(EnrollmentCohort.lab_id == lab_id)
-        .group_by(Project.id, User.name, User.last_name)
-        .order_by(func.count(ProjectStar.id).desc())
+        .order_by(Project.star_count.desc())
         .limit(5)
         .all()
     )
 
-    top_projects = [
+    return [
         TopProject(
             project_id=row[0],
             project_name=row[1],
@@ -204,13 +223,122 @@ def get_lab_dashboard_stats(db: Session, lab_id: int) -> LabDashboardStats:
         for row in top_projects_query
     ]
 
-    # --- 5. Assemble and Return Final Dashboard Object ---
+
+# The independent sections of the lab dashboard, each a function of (db, lab_id).
+LAB_DASHBOARD_SECTIONS: Dict[str, Callable[[Session, int], Any]] = {
+    "total_students": _total_students,
+    "total_teachers": _total_teachers,
+    "total_projects": _total_projects,
+    "total_stars": _total_stars,
+    "student_distribution": _student_distribution,
+    "grok_specialization": _grok_specialization,
+    "performance_distribution": _performance_distribution,
+    "project_trend": _project_trend,
+    "top_students": _top_students,
+    "top_projects": _top_projects,
+}
+
+
+class SectionTimings:
+    """Running latency per dashboard section, for tuning."""
+
+    def __init__(self):
+        self._stats: Dict[str, List[float]] = {}  # name -> [count, total_ms, max_ms]
+        self._lock = threading.Lock()
+
+    def record(self, timings: Dict[str, float]) -> None:
+        with self._lock:
+            for name, elapsed_ms in timings.items():
+                stats = self._stats.setdefault(name, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed_ms
+                stats[2] = max(stats[2], elapsed_ms)
+
+    def stats(self) -> List[dict]:
+        with self._lock:
+            return [
+                {
+                    "section": name,
+                    "count": count,
+                    "avg_ms": total_ms / count,
+                    "max_ms": max_ms,
+                }
+                for name, (count, total_ms, max_ms) in sorted(self._stats.items())
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+section_timings = SectionTimings()
+
+
+def _assemble_lab_dashboard(sections: Dict[str, Any]) -> LabDashboardStats:
     return LabDashboardStats(
-        kpis=kpis,
-        student_distribution=student_distribution,
-        grok_specialization=grok_specialization,
-        performance_distribution=performance_distribution,
-        project_trend=project_trend,
-        top_students=top_students,
-        top_projects=top_projects,
+        kpis=KPIStats(
+            total_students=sections["total_students"],
+            total_teachers=sections["total_teachers"],
+            total_projects=sections["total_projects"],
+            total_stars=sections["total_stars"],
+        ),
+        student_distribution=sections["student_distribution"],
+        grok_specialization=sections["grok_specialization"],
+        performance_distribution=sections["performance_distribution"],
+        project_trend=sections["project_trend"],
+        top_students=sections["top_students"],
+        top_projects=sections["top_projects"],
+    )
+
+
+def get_lab_dashboard_stats(db: Session, lab_id: int) -> LabDashboardStats:
+    """
+    Computes and returns all statistics for the lab dashboard, one section after another.
+    """
+    return _assemble_lab_dashboard(
+        {name: section(db, lab_id) for name, section in LAB_DASHBOARD_SECTIONS.items()}
+    )
+
+
+async def get_lab_dashboard_stats_async(
+    db: AsyncSession, lab_id: int, timings: Optional[Dict[str, float]] = None
+) -> LabDashboardStats:
+    """
+    Async variant of get_lab_dashboard_stats for the async engine.
+    Served from lab_dashboard_cache when possible. Otherwise the sections run
+    concurrently, each in its own session (and so on its own pooled connection)
+    of the same engine as `db`, at most DASHBOARD_MAX_CONCURRENCY at a time.
+    Per-section latency in milliseconds is written to `timings` (if given; it
+    stays empty on a cache hit) and recorded in section_timings. Results read
+    from the replica are not cached right after a write to the lab.
+    """
+    cached, generation = lab_dashboard_cache.get(lab_id)
+    if cached is not None:
+        return cached
+
+    started = time.perf_counter()
+    timings = {} if timings is None else timings
+    semaphore = asyncio.Semaphore(settings.DASHBOARD_MAX_CONCURRENCY)
+
+    async def run(name: str, section: Callable[[Session, int], Any]):
+        async with semaphore:
+            start = time.perf_counter()
+            async with AsyncSession(bind=db.bind) as section_db:
+                result = await section_db.run_sync(section, lab_id)
+            timings[name] = (time.perf_counter() - start) * 1000
+        return name, result
+
+    results = await asyncio.gather(
+        *(run(name, section) for name, section in LAB_DASHBOARD_SECTIONS.items())
+    )
+    section_timings.record(timings)
+    stats = _assemble_lab_dashboard(dict(results))
+    lab_dashboard_cache.set(
+        lab_id,
+        stats,
+        generation,
+        (time.perf_counter() - started) * 1000,
+        from_replica=async_replica_engine is not None
+        and db.bind is async_replica_engine,
     )
+    return stats
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 
-from app.models import Project, ProjectStar, Mark, StudentEnrollment
+from app.models import Project, Mark, StudentEnrollment
 from app.schemas.dashboard_student import StudentDashboardStats
 from app.schemas.project import Project as ProjectSchema
 
@@ -19,18 +19,15 @@ def get_student_dashboard_stats(db: Session, student_id: int) -> StudentDashboar
 
     # 2. Total Stars Received
     total_stars = (
-        db.query(func.count(ProjectStar.id))
-        .join(Project)
+        db.query(func.sum(Project.star_count))
         .filter(Project.student_user_id == student_id)
         .scalar()
     )
 
     # 3. Recent Projects (Top 5)
     recent_projects_query = (
-        db.query(Project, func.count(ProjectStar.id).label("star_count"))
+        db.query(Project)
         .filter(Project.student_user_id == student_id)
-        .outerjoin(ProjectStar, Project.id == ProjectStar.project_id)
-        .group_by(Project.id)
         .options(joinedload(Project.student))
         .order_by(Project.submission_date.desc())
         .limit(5)
@@ -38,7 +35,7 @@ def get_student_dashboard_stats(db: Session, student_id: int) -> StudentDashboar
     )
 
     recent_projects_list = []
-    for p, star_count in recent_projects_query:
+    for p in recent_projects_query:
         recent_projects_list.append(
             ProjectSchema(
                 id=p.id,
@@ -48,7 +45,7 @@ def get_student_dashboard_stats(db: Session, student_id: int) -> StudentDashboar
                 photo_urls=p.photo_urls,
                 submission_date=p.submission_date,
                 author=p.student,
-                star_count=star_count,
+                star_count=p.star_count,
             )
         )
 
@@ -1,10 +1,25 @@
+from collections import Counter
+from sqlalchemy import delete, insert, literal, select
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 
+from app.core.dashboard_cache import invalidate_labs_of_cohorts, lab_dashboard_cache
+from app.db.upsert import dialect_insert
+from app.models.mark import Mark
 from app.models.user import User, UserRole
-from app.schemas.enrollment import EnrollmentCohortCreate, EnrollmentCohortUpdate
+from app.schemas.enrollment import (
+    EnrollmentCohortCreate,
+    EnrollmentCohortUpdate,
+    BulkEnrollmentResult,
+    CohortEnrollmentCount,
+    RosterSyncResult,
+)
 from app.models.enrollment import EnrollmentCohort, StudentEnrollment, CohortTeacher
 
+# Rows per INSERT statement (and IDs per IN list) for bulk enrollment; keeps
+# each statement well under the bind-parameter limits of PostgreSQL and SQLite.
+ENROLLMENT_BATCH_SIZE = 1000
+
 
 def generate_cohort_name(cohort_data: EnrollmentCohortCreate) -> str:
     """Generates a standardized cohort name."""
@@ -31,6 +46,7 @@ def create_cohort_in_lab(
     db.add(db_cohort)
     db.commit()
     db.refresh(db_cohort)
+    lab_dashboard_cache.invalidate([lab_id])
     return db_cohort
 
 
@@ -41,58 +57,166 @@ def get_cohorts_by_lab(db: Session, lab_id: int) -> List[EnrollmentCohort]:
     return db.query(EnrollmentCohort).filter(EnrollmentCohort.lab_id == lab_id).all()
 
 
-def enroll_students_in_cohort(
-    db: Session, cohort_id: int, student_ids: List[int]
-) -> List[StudentEnrollment]:
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _validate_students(db: Session, student_ids: List[int]) -> None:
+    """Raises ValueError unless every ID belongs to a student."""
+    found_students = set()
+    for chunk in _chunks(student_ids, ENROLLMENT_BATCH_SIZE):
+        found_students.update(
+            row[0]
+            for row in db.query(User.id).filter(
+                User.id.in_(chunk), User.role == UserRole.student
+            )
+        )
+    if len(found_students) != len(student_ids):
+        missing_ids = set(student_ids) - found_students
+        raise ValueError(
+            f"The following student IDs were not found or are not students: {missing_ids}"
+        )
+
+
+def bulk_enroll_students(
+    db: Session, enrollments: Dict[int, List[int]]
+) -> BulkEnrollmentResult:
     """
-    Enrolls a list of students into a specific cohort.
-    - Validates that the cohort exists.
-    - Validates that all student IDs correspond to actual students.
-    - Avoids creating duplicate enrollments.
+    Enrolls students into several cohorts at once ({cohort_id: [student ids]}).
+    - Validates that every cohort exists and every ID belongs to a student.
+    - Inserts in batches with ON CONFLICT DO NOTHING against the unique
+      (cohort_id, student_user_id) index, so existing enrollments are skipped.
+    Everything is applied in one transaction; returns counts, not rows.
     """
-    # 1. Validate Cohort
-    cohort = db.query(EnrollmentCohort).filter(EnrollmentCohort.id == cohort_id).first()
-    if not cohort:
-        raise ValueError(f"Cohort with id {cohort_id} not found.")
+    pairs = {
+        (cohort_id, student_id)
+        for cohort_id, student_ids in enrollments.items()
+        for student_id in student_ids
+    }
+    cohort_ids = sorted(enrollments)
+    student_ids = sorted({student_id for _, student_id in pairs})
+
+    # 1. Validate Cohorts
+    lab_by_cohort = dict(
+        db.query(EnrollmentCohort.id, EnrollmentCohort.lab_id).filter(
+            EnrollmentCohort.id.in_(cohort_ids)
+        )
+    )
+    found_cohorts = set(lab_by_cohort)
+    if len(found_cohorts) != len(cohort_ids):
+        missing_ids = set(cohort_ids) - found_cohorts
+        raise ValueError(f"The following cohort IDs were not found: {missing_ids}")
 
     # 2. Validate Students
-    valid_students = (
-        db.query(User)
-        .filter(User.id.in_(student_ids), User.role == UserRole.student)
-        .all()
+    _validate_students(db, student_ids)
+
+    # 3. Insert, skipping existing enrollments
+    enrolled_per_cohort = Counter()
+    rows = [
+        {"cohort_id": cohort_id, "student_user_id": student_id}
+        for cohort_id, student_id in sorted(pairs)
+    ]
+    enrollments_table = StudentEnrollment.__table__
+    try:
+        for chunk in _chunks(rows, ENROLLMENT_BATCH_SIZE):
+            inserted = db.execute(
+                dialect_insert(db, enrollments_table)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=["cohort_id", "student_user_id"])
+                .returning(enrollments_table.c.cohort_id)
+            )
+            enrolled_per_cohort.update(row[0] for row in inserted)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    lab_dashboard_cache.invalidate(
+        lab_by_cohort[cohort_id] for cohort_id in enrolled_per_cohort
     )
-    if len(valid_students) != len(student_ids):
-        found_ids = {s.id for s in valid_students}
-        missing_ids = set(student_ids) - found_ids
-        raise ValueError(
-            f"The following student IDs were not found or are not students: {missing_ids}"
-        )
 
-    # 3. Avoid Duplicates
-    existing_enrollments = (
-        db.query(StudentEnrollment.student_user_id)
-        .filter(
-            StudentEnrollment.cohort_id == cohort_id,
-            StudentEnrollment.student_user_id.in_(student_ids),
+    requested_per_cohort = Counter(cohort_id for cohort_id, _ in pairs)
+    cohorts = [
+        CohortEnrollmentCount(
+            cohort_id=cohort_id,
+            enrolled=enrolled_per_cohort[cohort_id],
+            already_enrolled=requested_per_cohort[cohort_id]
+            - enrolled_per_cohort[cohort_id],
         )
-        .all()
+        for cohort_id in cohort_ids
+    ]
+    return BulkEnrollmentResult(
+        enrolled=sum(c.enrolled for c in cohorts),
+        already_enrolled=sum(c.already_enrolled for c in cohorts),
+        cohorts=cohorts,
     )
-    existing_student_ids = {e[0] for e in existing_enrollments}
 
-    new_enrollments = []
-    for student_id in student_ids:
-        if student_id not in existing_student_ids:
-            enrollment = StudentEnrollment(
-                cohort_id=cohort_id, student_user_id=student_id
+
+def sync_cohort_roster(
+    db: Session, cohort_id: int, student_ids: List[int]
+) -> RosterSyncResult:
+    """
+    Makes `student_ids` the exact roster of a cohort.
+    The difference with the current enrollments is computed in SQL: students
+    that are not enrolled yet are inserted with one INSERT ... SELECT, and
+    enrollments of students no longer listed are deleted (with their marks)
+    by set-based DELETEs. All of it runs in one transaction.
+    """
+    student_ids = sorted(set(student_ids))
+    _validate_students(db, student_ids)
+
+    enrollments_table = StudentEnrollment.__table__
+    marks_table = Mark.__table__
+    enrolled = select(enrollments_table.c.student_user_id).where(
+        enrollments_table.c.cohort_id == cohort_id
+    )
+    departing = (
+        enrollments_table.c.cohort_id == cohort_id,
+        enrollments_table.c.student_user_id.not_in(student_ids),
+    )
+    try:
+        db.execute(
+            delete(marks_table).where(
+                marks_table.c.enrollment_id.in_(
+                    select(enrollments_table.c.id).where(*departing)
+                )
+            )
+        )
+        unenrolled = db.execute(delete(enrollments_table).where(*departing)).rowcount
+        enrolled_count = db.execute(
+            insert(enrollments_table).from_select(
+                ["cohort_id", "student_user_id"],
+                select(literal(cohort_id), User.id).where(
+                    User.id.in_(student_ids), User.id.not_in(enrolled)
+                ),
             )
-            db.add(enrollment)
-            new_enrollments.append(enrollment)
+        ).rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if enrolled_count or unenrolled:
+        invalidate_labs_of_cohorts(db, [cohort_id])
 
-    db.commit()
-    for enrollment in new_enrollments:
-        db.refresh(enrollment)
+    return RosterSyncResult(
+        enrolled=enrolled_count,
+        unenrolled=unenrolled,
+        unchanged=len(student_ids) - enrolled_count,
+    )
 
-    return new_enrollments
+
+def enroll_students_in_cohort(
+    db: Session, cohort_id: int, student_ids: List[int]
+) -> int:
+    """
+    Enrolls a list of students into a specific cohort.
+    - Validates that the cohort exists.
+    - Validates that all student IDs correspond to actual students.
+    - Avoids creating duplicate enrollments.
+    Returns the number of new enrollments.
+    """
+    result = bulk_enroll_students(db, {cohort_id: student_ids})
+    return result.enrolled
 
 
 def update_cohort(
@@ -108,6 +232,7 @@ def update_cohort(
         setattr(db_cohort, key, value)
     db.commit()
     db.refresh(db_cohort)
+    lab_dashboard_cache.invalidate([db_cohort.lab_id])
     return db_cohort
 
 
@@ -140,6 +265,8 @@ def unenroll_student(db: Session, enrollment_id: int) -> Optional[StudentEnrollm
     )
     if not enrollment:
         return None
+    cohort_id = enrollment.cohort_id
     db.delete(enrollment)
     db.commit()
+    invalidate_labs_of_cohorts(db, [cohort_id])
     return enrollment
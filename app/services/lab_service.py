@@ -2,8 +2,12 @@ from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 
 from app.models.lab import Lab
+from app.models.user import TeacherProfile
 from app.schemas.lab import LabCreate, LabUpdate
 from app.services import school_service  # To verify school existence
+from app.services import user_service
+from app.core.dashboard_cache import lab_dashboard_cache
+from app.core.user_cache import user_cache
 
 
 def get_lab(db: Session, lab_id: int) -> Optional[Lab]:
@@ -91,6 +95,18 @@ def delete_lab(db: Session, lab_id: int) -> Optional[Lab]:
     if not db_lab:
         return None
 
+    # Staff of this lab lose their lab assignment, so revoke their tokens
+    staff_ids = [
+        user_id
+        for (user_id,) in db.query(TeacherProfile.user_id).filter(
+            TeacherProfile.lab_id == lab_id
+        )
+    ]
+    user_service.revoke_tokens(db, user_ids=staff_ids)
+
     db.delete(db_lab)
     db.commit()
+    for user_id in staff_ids:
+        user_cache.invalidate(user_id)
+    lab_dashboard_cache.invalidate([lab_id])
     return db_lab
@@ -1,36 +1,37 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc, extract
+from collections import Counter
 from datetime import datetime
+from typing import List, Optional, Tuple
 
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload, contains_eager
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, select
+
+from app.core.config import settings
+from app.core.leaderboards import (
+    PERIODS,
+    PROJECT_POINTS,
+    STAR_POINTS,
+    PeriodBoards,
+    leaderboards,
+)
+from app.core.periods import current_period
+from app.db.session import SessionLocal
 from app.models import User, Project, ProjectStar
+from app.models.user import UserRole
+
+# Rebuilds that keep racing with project/star changes are retried this often.
+LEADERBOARD_REBUILD_ATTEMPTS = 3
 
 
-def get_leaderboard(db: Session, item_type: str, period: str):
+def get_leaderboard(db: Session, item_type: str, period: str, limit: int = 10):
     """
-    Calculates and returns a top 10 leaderboard for students or projects
-    based on a specified time period.
+    Calculates and returns a top `limit` leaderboard for students or projects
+    based on a specified time period, directly in SQL.
     """
-    now = datetime.utcnow()
-
-    project_filter = []
-    star_filter = []
-
-    if period == "month":
-        project_filter.extend(
-            [
-                extract("year", Project.submission_date) == now.year,
-                extract("month", Project.submission_date) == now.month,
-            ]
-        )
-        star_filter.extend(
-            [
-                extract("year", ProjectStar.starred_at) == now.year,
-                extract("month", ProjectStar.starred_at) == now.month,
-            ]
-        )
-    elif period == "year":
-        project_filter.append(extract("year", Project.submission_date) == now.year)
-        star_filter.append(extract("year", ProjectStar.starred_at) == now.year)
+    window = current_period(period)
+    project_filter = window.filter(Project.submission_date)
+    star_filter = window.filter(ProjectStar.starred_at)
 
     if item_type == "student":
         projects_subquery = (
@@ -42,15 +43,27 @@ def get_leaderboard(db: Session, item_type: str, period: str):
             .subquery()
         )
 
-        stars_subquery = (
-            db.query(
-                Project.student_user_id, func.count(ProjectStar.id).label("star_count")
+        if period == "all_time":
+            # Lifetime totals come straight from the denormalized counter.
+            stars_subquery = (
+                db.query(
+                    Project.student_user_id,
+                    func.sum(Project.star_count).label("star_count"),
+                )
+                .group_by(Project.student_user_id)
+                .subquery()
+            )
+        else:
+            stars_subquery = (
+                db.query(
+                    Project.student_user_id,
+                    func.count(ProjectStar.id).label("star_count"),
+                )
+                .join(ProjectStar)
+                .filter(*star_filter)
+                .group_by(Project.student_user_id)
+                .subquery()
             )
-            .join(ProjectStar)
-            .filter(*star_filter)
-            .group_by(Project.student_user_id)
-            .subquery()
-        )
 
         query = (
             db.query(
@@ -71,7 +84,7 @@ def get_leaderboard(db: Session, item_type: str, period: str):
 
         results = []
         for user, p_count, s_count in query.all():
-            score = (p_count * 10) + (s_count * 2)
+            score = (p_count * PROJECT_POINTS) + (s_count * STAR_POINTS)
             # FIX: Include all necessary counts in the returned dictionary
             results.append(
                 {
@@ -83,20 +96,176 @@ def get_leaderboard(db: Session, item_type: str, period: str):
             )
 
         results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:10]
+        return results[:limit]
 
     elif item_type == "project":
+        if period == "all_time":
+            return (
+                db.query(Project, Project.star_count)
+                .join(Project.student)
+                .options(contains_eager(Project.student))
+                .order_by(desc(Project.star_count))
+                .limit(limit)
+                .all()
+            )
         # FIX: Added joinedload for the student relationship to ensure 'author' is available
         query = (
             db.query(Project, func.count(ProjectStar.id).label("star_count"))
             .outerjoin(ProjectStar)
             .join(Project.student)
+            .options(contains_eager(Project.student))
             .filter(*star_filter)
             .group_by(Project.id, User.id)
             .order_by(desc("star_count"))
-            .limit(10)
+            .limit(limit)
             .all()
         )
         return query
 
     return []
+
+
+async def get_leaderboard_async(
+    db: AsyncSession, item_type: str, period: str, limit: int = 10
+):
+    """
+    Async variant of get_leaderboard for the async engine.
+    The returned rows have their authors loaded, so no lazy loads are needed.
+    """
+    return await db.run_sync(
+        get_leaderboard, item_type=item_type, period=period, limit=limit
+    )
+
+
+def rebuild_leaderboards(db: Session, force: bool = False) -> bool:
+    """
+    Recomputes the in-memory month, year and all-time boards from the database.
+    Like get_leaderboard, only users with the student role are ranked as students.
+    Unless `force`, a build that raced with a project or star change is
+    discarded; returns whether the boards were loaded.
+    """
+    generation = None if force else leaderboards.generation()
+    now = datetime.utcnow()
+    boards = {}
+    for name in PERIODS:
+        window = current_period(name, now)
+        students, projects = Counter(), Counter()
+        project_counts = (
+            db.query(Project.student_user_id, func.count(Project.id))
+            .join(User, User.id == Project.student_user_id)
+            .filter(User.role == UserRole.student)
+            .filter(*window.filter(Project.submission_date))
+            .group_by(Project.student_user_id)
+        )
+        for student_id, count in project_counts:
+            students[student_id] += count * PROJECT_POINTS
+
+        if name == "all_time":
+            star_counts = (
+                db.query(
+                    Project.id, Project.student_user_id, User.role, Project.star_count
+                )
+                .join(User, User.id == Project.student_user_id)
+                .filter(Project.star_count > 0)
+            )
+        else:
+            star_counts = (
+                db.query(
+                    Project.id,
+                    Project.student_user_id,
+                    User.role,
+                    func.count(ProjectStar.id),
+                )
+                .join(User, User.id == Project.student_user_id)
+                .join(ProjectStar, ProjectStar.project_id == Project.id)
+                .filter(*window.filter(ProjectStar.starred_at))
+                .group_by(Project.id, Project.student_user_id, User.role)
+            )
+        for project_id, student_id, role, count in star_counts:
+            projects[project_id] += count
+            if role == UserRole.student:
+                students[student_id] += count * STAR_POINTS
+        boards[name] = PeriodBoards(window, students, projects)
+    non_students = {
+        user_id
+        for (user_id,) in db.query(Project.student_user_id)
+        .join(User, User.id == Project.student_user_id)
+        .filter(User.role != UserRole.student)
+        .distinct()
+    }
+    return leaderboards.load(boards, generation, non_students)
+
+
+def refresh_leaderboards() -> None:
+    """
+    Rebuilds the boards from the primary if they are missing or stale.
+    If every attempt races with a change, the last build is served but left
+    stale, so the next read rebuilds again.
+    """
+    with leaderboards.rebuild_lock:
+        if not leaderboards.is_stale():
+            return
+        db = SessionLocal()
+        try:
+            for _ in range(LEADERBOARD_REBUILD_ATTEMPTS):
+                if rebuild_leaderboards(db):
+                    return
+                db.commit()  # End the read transaction so the retry sees the change
+            rebuild_leaderboards(db, force=True)
+            leaderboards.invalidate()
+        finally:
+            db.close()
+
+
+async def get_ranked_leaderboard_async(
+    db: AsyncSession, item_type: str, period: str, limit: int
+) -> List[Tuple[int, object, int]]:
+    """
+    Returns the top `limit` students (User rows) or projects (Project rows with
+    their author loaded) as (rank, row, score) tuples.
+    Ranks come from the in-memory boards; only the `limit` rows are then loaded.
+    """
+    if not settings.LEADERBOARD_IN_MEMORY:
+        results = await get_leaderboard_async(db, item_type, period, limit)
+        if item_type == "student":
+            return [(i + 1, r["user"], r["score"]) for i, r in enumerate(results)]
+        return [(i + 1, p, s_count) for i, (p, s_count) in enumerate(results)]
+
+    if leaderboards.is_stale():
+        await run_in_threadpool(refresh_leaderboards)
+    entries = leaderboards.top(item_type, period, limit)
+    ids = [item_id for _, item_id, _ in entries]
+    if item_type == "student":
+        query = select(User).where(User.id.in_(ids))
+    else:
+        query = (
+            select(Project)
+            .options(joinedload(Project.student))
+            .where(Project.id.in_(ids))
+        )
+    rows = {row.id: row for row in (await db.execute(query)).scalars().unique()}
+    return [
+        (rank, rows[item_id], score)
+        for rank, item_id, score in entries
+        if item_id in rows
+    ]
+
+
+async def get_student_rank_async(
+    db: AsyncSession, student_id: int, period: str
+) -> Tuple[Optional[int], int, int]:
+    """(rank, score, number of ranked students) of one student for a period."""
+    if settings.LEADERBOARD_IN_MEMORY:
+        if leaderboards.is_stale():
+            await run_in_threadpool(refresh_leaderboards)
+        return leaderboards.student_rank(student_id, period)
+    results = await get_leaderboard_async(db, "student", period, limit=None)
+    scores = [r["score"] for r in results]
+    for r in results:
+        if r["user"].id == student_id:
+            return (
+                1 + sum(1 for s in scores if s > r["score"]),
+                r["score"],
+                len(results),
+            )
+    return None, 0, len(results)
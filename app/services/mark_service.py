@@ -1,9 +1,25 @@
+import csv
+import math
+from itertools import islice
+from sqlalchemy import case, insert, or_, update
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from app.models.mark import Mark
 from app.models.enrollment import StudentEnrollment
-from app.schemas.mark import MarkCreate
+from app.models.user import User
+from app.schemas.mark import (
+    MarkCreate,
+    MarkUpdate,
+    MarkBatchUpdateItem,
+    MarkImportError,
+    MarksImportResult,
+)
+
+# CSV rows parsed, resolved and inserted per round trip.
+MARKS_IMPORT_CHUNK_SIZE = 1000
+# Failed rows beyond this are counted but not listed in the report.
+MARKS_IMPORT_MAX_ERRORS = 1000
 
 
 def create_mark_for_enrollment(
@@ -30,6 +46,101 @@ def create_mark_for_enrollment(
     return db_mark
 
 
+def update_mark(db: Session, mark_id: int, mark_data: MarkUpdate) -> Optional[Mark]:
+    db_mark = db.query(Mark).filter(Mark.id == mark_id).first()
+    if not db_mark:
+        return None
+    update_data = mark_data.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_mark, key, value)
+    db.commit()
+    db.refresh(db_mark)
+    return db_mark
+
+
+# Both mark columns are DECIMAL(5, 2), so stored values must round below 1000.
+MAX_MARK_VALUE = 1000
+
+
+def _check_mark_values(marks_obtained: float, total_marks: float) -> None:
+    """
+    Raises ValueError unless 0 <= marks_obtained <= total_marks, total_marks > 0
+    and total_marks fits the mark columns.
+    """
+    if not (math.isfinite(marks_obtained) and math.isfinite(total_marks)):
+        raise ValueError("marks_obtained and total_marks must be finite numbers")
+    if total_marks <= 0 or not 0 <= marks_obtained <= total_marks:
+        raise ValueError("marks_obtained must be between 0 and total_marks")
+    if round(total_marks, 2) >= MAX_MARK_VALUE:
+        raise ValueError(f"total_marks must be less than {MAX_MARK_VALUE}")
+
+
+def update_marks(
+    db: Session,
+    updates: List[MarkBatchUpdateItem],
+    current: Optional[Dict[int, Tuple[float, float]]] = None,
+) -> int:
+    """
+    Applies many mark updates with a single UPDATE statement.
+    Each column is set through a CASE on the mark id, so marks that leave a
+    field unset keep their current value. Returns the number of updated marks.
+    `current` maps mark ids to their stored (marks_obtained, total_marks); it is
+    read here when not given. The merged values of every mark, including the
+    column range (see MAX_MARK_VALUE), are validated before anything is
+    written, raising ValueError for the first invalid one.
+    """
+    marks_table = Mark.__table__
+    changes_by_column = {}
+    for item in updates:
+        update_data = item.dict(exclude_unset=True, exclude={"id"})
+        for column, value in update_data.items():
+            if value is not None:
+                changes_by_column.setdefault(column, {})[item.id] = value
+
+    obtained_changes = changes_by_column.get("marks_obtained", {})
+    total_changes = changes_by_column.get("total_marks", {})
+    scored = obtained_changes.keys() | total_changes.keys()
+    if scored:
+        if current is None:
+            current = {
+                mark_id: (marks_obtained, total_marks)
+                for mark_id, marks_obtained, total_marks in db.query(
+                    Mark.id, Mark.marks_obtained, Mark.total_marks
+                ).filter(Mark.id.in_(scored))
+            }
+        for mark_id in sorted(scored):
+            if mark_id not in current:
+                continue  # Unknown marks are not updated
+            marks_obtained, total_marks = current[mark_id]
+            try:
+                _check_mark_values(
+                    obtained_changes.get(mark_id, marks_obtained),
+                    total_changes.get(mark_id, total_marks),
+                )
+            except ValueError as e:
+                raise ValueError(f"Mark {mark_id}: {e}")
+
+    values = {}
+    for column, changes in changes_by_column.items():
+        values[column] = case(
+            changes, value=marks_table.c.id, else_=marks_table.c[column]
+        )
+    if not values:
+        return 0
+
+    try:
+        updated = db.execute(
+            update(marks_table)
+            .where(marks_table.c.id.in_(set().union(*changes_by_column.values())))
+            .values(values)
+        ).rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return updated
+
+
 def get_marks_for_student(db: Session, student_id: int) -> List[Mark]:
     """
     Retrieves all marks for a specific student across all their enrollments.
@@ -47,3 +158,129 @@ def get_marks_for_enrollment(db: Session, enrollment_id: int) -> List[Mark]:
     Retrieves all marks for a specific enrollment record.
     """
     return db.query(Mark).filter(Mark.enrollment_id == enrollment_id).all()
+
+
+def _parse_mark_row(row: dict) -> dict:
+    """
+    Validates one CSV row. Raises ValueError with a readable message.
+    The student is returned as ("id", user id) or ("mobile", mobile number).
+    """
+    student_id = (row.get("student_id") or "").strip()
+    mobile_number = (row.get("mobile_number") or "").strip()
+    if bool(student_id) == bool(mobile_number):
+        raise ValueError("Give exactly one of student_id and mobile_number")
+    if student_id:
+        if not student_id.isdigit():
+            raise ValueError("student_id must be a whole number")
+        student = ("id", int(student_id))
+    else:
+        student = ("mobile", mobile_number)
+    assessment_name = (row.get("assessment_name") or "").strip()
+    if not assessment_name:
+        raise ValueError("Missing assessment_name")
+    try:
+        marks_obtained = float(row.get("marks_obtained") or "")
+        total_marks = float(row.get("total_marks") or "")
+    except ValueError:
+        raise ValueError("marks_obtained and total_marks must be numbers")
+    _check_mark_values(marks_obtained, total_marks)
+    return {
+        "student": student,
+        "assessment_name": assessment_name,
+        "marks_obtained": marks_obtained,
+        "total_marks": total_marks,
+    }
+
+
+def _resolve_enrollments(db: Session, cohort_id: int, students: set) -> dict:
+    """
+    Maps each ("id", user id) / ("mobile", mobile number) key to its enrollment
+    id in the cohort. Ids and mobile numbers are matched separately, so a
+    digit-only mobile number can never be mistaken for another student's id.
+    """
+    ids = {value for kind, value in students if kind == "id"}
+    mobile_numbers = {value for kind, value in students if kind == "mobile"}
+    rows = (
+        db.query(StudentEnrollment.id, User.id, User.mobile_number)
+        .join(User, StudentEnrollment.student_user_id == User.id)
+        .filter(
+            StudentEnrollment.cohort_id == cohort_id,
+            or_(User.id.in_(ids), User.mobile_number.in_(mobile_numbers)),
+        )
+        .all()
+    )
+    enrollments = {}
+    for enrollment_id, user_id, mobile_number in rows:
+        if user_id in ids:
+            enrollments[("id", user_id)] = enrollment_id
+        if mobile_number in mobile_numbers:
+            enrollments[("mobile", mobile_number)] = enrollment_id
+    return enrollments
+
+
+def import_marks_csv(
+    db: Session, cohort_id: int, lines: Iterable[str]
+) -> MarksImportResult:
+    """
+    Imports marks for a cohort from CSV text with the header
+    `student_id,mobile_number,assessment_name,marks_obtained,total_marks`;
+    each row identifies its student by exactly one of student_id (user id) and
+    mobile_number. Either student column may be left out of the header.
+    - Rows are read lazily and handled in chunks of MARKS_IMPORT_CHUNK_SIZE:
+      one query resolves the chunk's enrollments and one INSERT adds its marks,
+      so memory use does not grow with the file.
+    - Invalid rows are skipped and reported by line number; the valid rows are
+      committed together at the end.
+    """
+    reader = csv.DictReader(lines, skipinitialspace=True)
+    fieldnames = set(reader.fieldnames or [])
+    missing = {"assessment_name", "marks_obtained", "total_marks"} - fieldnames
+    if not fieldnames & {"student_id", "mobile_number"}:
+        missing.add("student_id or mobile_number")
+    if missing:
+        raise ValueError(f"CSV is missing the columns: {sorted(missing)}")
+
+    imported, failed, errors = 0, 0, []
+
+    def report(line: int, error: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < MARKS_IMPORT_MAX_ERRORS:
+            errors.append(MarkImportError(line=line, error=error))
+
+    try:
+        while True:
+            chunk, rows_read = [], 0
+            for row in islice(reader, MARKS_IMPORT_CHUNK_SIZE):
+                rows_read += 1
+                try:
+                    chunk.append((reader.line_num, _parse_mark_row(row)))
+                except ValueError as e:
+                    report(reader.line_num, str(e))
+            if not rows_read:
+                break
+            if not chunk:
+                continue
+
+            enrollments = _resolve_enrollments(
+                db, cohort_id, {mark["student"] for _, mark in chunk}
+            )
+            marks = []
+            for line, mark in chunk:
+                enrollment_id = enrollments.get(mark.pop("student"))
+                if enrollment_id is None:
+                    report(line, "Student is not enrolled in this cohort")
+                    continue
+                marks.append({**mark, "enrollment_id": enrollment_id})
+            if marks:
+                db.execute(insert(Mark.__table__), marks)
+                imported += len(marks)
+    except csv.Error as e:
+        db.rollback()
+        raise ValueError(f"Malformed CSV at line {reader.line_num}: {e}")
+    except Exception:
+        db.rollback()
+        raise
+    db.commit()
+    errors.sort(key=lambda e: e.line)
+    return MarksImportResult(imported=imported, failed=failed, errors=errors)
@@ -1,9 +1,15 @@
+from datetime import datetime
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Tuple
+
+from app.core.dashboard_cache import invalidate_labs_of_cohorts, lab_dashboard_cache
+from app.core.leaderboards import leaderboards
+from app.db.upsert import dialect_insert
 
 from app.models.project import Project, ProjectStar
-from app.models.enrollment import StudentEnrollment
+from app.models.enrollment import EnrollmentCohort, StudentEnrollment
 from app.schemas.project import ProjectCreate, ProjectUpdate
 
 
@@ -33,6 +39,10 @@ def create_project(
     db.add(db_project)
     db.commit()
     db.refresh(db_project)
+    leaderboards.project_created(
+        db_project.id, db_project.student_user_id, db_project.submission_date
+    )
+    invalidate_labs_of_cohorts(db, [db_project.cohort_id])
     return db_project
 
 
@@ -40,49 +50,146 @@ def get_projects_by_lab(db: Session, lab_id: int) -> List[Project]:
     """
     Retrieves all projects associated with a lab, including author and star count.
     """
-    # This query is complex: Project -> EnrollmentCohort -> Lab
-    # We also need to count stars for each project.
-    projects = (
-        db.query(Project, func.count(ProjectStar.id).label("star_count"))
+    # Project -> EnrollmentCohort -> Lab; star_count is a column on the project.
+    return (
+        db.query(Project)
         .join(Project.cohort)
-        .filter(Project.cohort.has(lab_id=lab_id))
-        .outerjoin(ProjectStar, Project.id == ProjectStar.project_id)
-        .group_by(Project.id)
+        .filter(EnrollmentCohort.lab_id == lab_id)
         .options(joinedload(Project.student))  # Eager load the student author
         .all()
     )
 
-    # The result is a list of tuples (Project, star_count). We need to combine them.
-    response_objects = []
-    for project, star_count in projects:
-        project.star_count = star_count
-        response_objects.append(project)
 
-    return response_objects
+def _delete_star(db: Session, project_id: int, user_id: int) -> Optional[datetime]:
+    """Deletes the star if present; returns when it had been given."""
+    return db.execute(
+        delete(ProjectStar)
+        .where(ProjectStar.project_id == project_id, ProjectStar.user_id == user_id)
+        .returning(ProjectStar.starred_at)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+
+
+def _insert_star(db: Session, project_id: int, user_id: int) -> Optional[datetime]:
+    """Inserts the star if missing; returns its timestamp."""
+    # The unique (project_id, user_id) index makes a concurrent duplicate a no-op.
+    return db.execute(
+        dialect_insert(db, ProjectStar)
+        .values(project_id=project_id, user_id=user_id)
+        .on_conflict_do_nothing(index_elements=["project_id", "user_id"])
+        .returning(ProjectStar.starred_at)
+    ).scalar()
+
+
+def _finish_star_change(
+    db: Session, project_id: int, starred_at: Optional[datetime], delta: int
+) -> Optional[int]:
+    # Relative update in the same transaction as the star row, so concurrent
+    # stars cannot overwrite each other's counts. The lab id comes back with the
+    # counter so invalidating its dashboard needs no further query.
+    lab_id = (
+        select(EnrollmentCohort.lab_id)
+        .where(EnrollmentCohort.id == Project.cohort_id)
+        .scalar_subquery()
+    )
+    row = db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(star_count=Project.star_count + delta)
+        .returning(Project.star_count, Project.student_user_id, lab_id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None:
+        # Unknown project
+        db.rollback()
+        return None
+    db.commit()
+    star_count, student_id, lab_id = row
+    if delta:
+        leaderboards.star_changed(project_id, student_id, starred_at, delta)
+        lab_dashboard_cache.invalidate([lab_id])
+    return star_count
 
 
-def star_unstar_project(db: Session, project_id: int, user_id: int) -> bool:
+def set_project_star(
+    db: Session, project_id: int, user_id: int, starred: bool
+) -> Optional[Tuple[bool, int]]:
     """
-    Adds or removes a star from a project for a given user.
-    Returns True if the project was starred, False if it was unstarred.
+    Idempotently stars (starred=True) or unstars a project for a user.
+    Returns (starred, star_count), or None if the project does not exist.
     """
-    existing_star = (
-        db.query(ProjectStar)
-        .filter(ProjectStar.project_id == project_id, ProjectStar.user_id == user_id)
-        .first()
+    try:
+        if starred:
+            starred_at = _insert_star(db, project_id, user_id)
+        else:
+            starred_at = _delete_star(db, project_id, user_id)
+    except IntegrityError:
+        # Foreign key violation: the project does not exist.
+        db.rollback()
+        return None
+    delta = (1 if starred else -1) if starred_at is not None else 0
+    star_count = _finish_star_change(db, project_id, starred_at, delta)
+    return None if star_count is None else (starred, star_count)
+
+
+def star_unstar_project(
+    db: Session, project_id: int, user_id: int
+) -> Optional[Tuple[bool, int]]:
+    """
+    Toggles a user's star on a project without a read first: the star is
+    deleted if present, otherwise inserted.
+    Returns (starred, star_count), or None if the project does not exist.
+    """
+    starred_at = _delete_star(db, project_id, user_id)
+    if starred_at is not None:
+        star_count = _finish_star_change(db, project_id, starred_at, -1)
+        return None if star_count is None else (False, star_count)
+    return set_project_star(db, project_id, user_id, starred=True)
+
+
+def remove_stars_given_by(db: Session, user_id: int) -> None:
+    """
+    Deletes every star a user has given and decrements the affected projects'
+    counters. Does not commit; used when deleting the user.
+    """
+    stars_by_user = (
+        select(func.count(ProjectStar.id))
+        .where(ProjectStar.project_id == Project.id, ProjectStar.user_id == user_id)
+        .scalar_subquery()
+    )
+    db.query(Project).filter(
+        Project.id.in_(
+            select(ProjectStar.project_id).where(ProjectStar.user_id == user_id)
+        )
+    ).update(
+        {Project.star_count: Project.star_count - stars_by_user},
+        synchronize_session=False,
+    )
+    db.query(ProjectStar).filter(ProjectStar.user_id == user_id).delete(
+        synchronize_session=False
     )
 
-    if existing_star:
-        # User has already starred, so unstar it.
-        db.delete(existing_star)
-        db.commit()
-        return False
-    else:
-        # User has not starred it, so add a star.
-        new_star = ProjectStar(project_id=project_id, user_id=user_id)
-        db.add(new_star)
-        db.commit()
-        return True
+
+def reconcile_star_counts(db: Session) -> int:
+    """
+    Recomputes star_count from project_stars for every project whose counter has drifted.
+    Returns the number of projects repaired.
+    """
+    actual = (
+        select(func.count(ProjectStar.id))
+        .where(ProjectStar.project_id == Project.id)
+        .scalar_subquery()
+    )
+    repaired = (
+        db.query(Project)
+        .filter(Project.star_count != actual)
+        .update({Project.star_count: actual}, synchronize_session=False)
+    )
+    db.commit()
+    if repaired:
+        leaderboards.invalidate()
+        lab_dashboard_cache.clear()
+    return repaired
 
 
 def update_project(
@@ -96,6 +203,7 @@ def update_project(
         setattr(db_project, key, value)
     db.commit()
     db.refresh(db_project)
+    invalidate_labs_of_cohorts(db, [db_project.cohort_id])
     return db_project
 
 
@@ -104,6 +212,17 @@ def delete_project(db: Session, project_id: int) -> Optional[Project]:
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
         return None
+    # What the leaderboards need to take the project and its stars back out
+    removed = (project.id, project.student_user_id, project.submission_date)
+    cohort_id = project.cohort_id
+    starred_at = [
+        row[0]
+        for row in db.query(ProjectStar.starred_at).filter(
+            ProjectStar.project_id == project_id
+        )
+    ]
     db.delete(project)
     db.commit()
+    leaderboards.project_deleted(*removed, starred_at)
+    invalidate_labs_of_cohorts(db, [cohort_id])
     return project
@@ -0,0 +1,131 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services import user_service
+
+
+def _digest(token: str) -> str:
+    # Refresh tokens are high-entropy random strings, so a fast hash is enough.
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _issue(db: Session, user_id: int) -> str:
+    now = datetime.utcnow()
+    # Keep the table compact: drop this user's tokens that have expired, and the
+    # used or revoked ones once they are past the reuse-detection window.
+    revoked_before = now - timedelta(
+        minutes=settings.REFRESH_TOKEN_REVOKED_RETENTION_MINUTES
+    )
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id,
+        or_(
+            RefreshToken.expires_at <= now,
+            RefreshToken.revoked_at <= revoked_before,
+        ),
+    ).delete(synchronize_session=False)
+
+    token = secrets.token_urlsafe(32)
+    db.add(
+        RefreshToken(
+            user_id=user_id,
+            token_hash=_digest(token),
+            expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    return token
+
+
+def create_refresh_token(db: Session, user_id: int) -> str:
+    """Issues a new refresh token for a user and returns its plain value."""
+    token = _issue(db, user_id)
+    db.commit()
+    return token
+
+
+def rotate_refresh_token(db: Session, token: str) -> Optional[Tuple[dict, str]]:
+    """
+    Exchanges a refresh token for a new one in a single indexed lookup.
+    Returns the access-token claims of the token's user and the new refresh token,
+    or None if the token is unknown, expired, logged out or already used.
+    Presenting an already-rotated token revokes every refresh token of that
+    user, since it may have been stolen; a logged-out token is simply refused.
+    """
+    db_token = (
+        db.query(RefreshToken)
+        .options(joinedload(RefreshToken.user).joinedload(User.teacher_profile))
+        .filter(RefreshToken.token_hash == _digest(token))
+        .first()
+    )
+    if not db_token:
+        return None
+
+    now = datetime.utcnow()
+    if db_token.revoked_at is not None:
+        if db_token.revoked_reason == RefreshToken.ROTATED:
+            revoke_user_refresh_tokens(db, user_id=db_token.user_id)
+        return None
+    if db_token.expires_at <= now:
+        return None
+
+    # Guarded update so two concurrent exchanges cannot both rotate the same token.
+    rotated = (
+        db.query(RefreshToken)
+        .filter(RefreshToken.id == db_token.id, RefreshToken.revoked_at.is_(None))
+        .update(
+            {
+                RefreshToken.revoked_at: now,
+                RefreshToken.revoked_reason: RefreshToken.ROTATED,
+            },
+            synchronize_session=False,
+        )
+    )
+    if rotated != 1:
+        db.rollback()
+        return None
+
+    claims = user_service.get_token_claims(db_token.user)
+    new_token = _issue(db, db_token.user_id)
+    db.commit()
+    return claims, new_token
+
+
+def revoke_refresh_token(db: Session, token: str) -> bool:
+    """Revokes a single refresh token. Returns False if it was not active."""
+    revoked = (
+        db.query(RefreshToken)
+        .filter(
+            RefreshToken.token_hash == _digest(token),
+            RefreshToken.revoked_at.is_(None),
+        )
+        .update(
+            {
+                RefreshToken.revoked_at: datetime.utcnow(),
+                RefreshToken.revoked_reason: RefreshToken.LOGGED_OUT,
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return revoked == 1
+
+
+def revoke_user_refresh_tokens(db: Session, user_id: int) -> None:
+    """Revokes every active refresh token of a user."""
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None)
+    ).update(
+        {
+            RefreshToken.revoked_at: datetime.utcnow(),
+            RefreshToken.revoked_reason: RefreshToken.REVOKED,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, extract
+from sqlalchemy import func, literal, select, tuple_, union_all
 from typing import List, Optional
 
+from app.core.leaderboards import PROJECT_POINTS, STAR_POINTS
+from app.core.periods import month_period
+from app.models.user import UserRole
 from app.models import (
     User,
     TeacherProfile,
@@ -64,16 +67,14 @@ def generate_lab_report(db: Session, cohort_id: int) -> Optional[LabReport]:
 
     # 3. Get Projects submitted for the Cohort
     projects_query = (
-        db.query(Project, func.count(ProjectStar.id).label("star_count"))
+        db.query(Project)
         .filter(Project.cohort_id == cohort_id)
-        .outerjoin(ProjectStar, Project.id == ProjectStar.project_id)
-        .group_by(Project.id)
         .options(joinedload(Project.student))
         .all()
     )
 
     projects_list = []
-    for p, star_count in projects_query:
+    for p in projects_query:
         projects_list.append(
             ProjectSchema(
                 id=p.id,
@@ -83,7 +84,7 @@ def generate_lab_report(db: Session, cohort_id: int) -> Optional[LabReport]:
                 photo_urls=p.photo_urls,
                 submission_date=p.submission_date,
                 author=p.student,
-                star_count=star_count,
+                star_count=p.star_count,
             )
         )
 
@@ -98,74 +99,110 @@ def generate_lab_report(db: Session, cohort_id: int) -> Optional[LabReport]:
     )
 
 
-def generate_top_student_report(db: Session, month: int, year: int) -> TopStudentReport:
+def generate_top_student_report(
+    db: Session,
+    month: int,
+    year: int,
+    limit: int = 100,
+    after_rank: Optional[int] = None,
+    after_student_id: Optional[int] = None,
+) -> TopStudentReport:
     """
     Generates a ranked report of top students for a given month and year.
     Score = (projects * 10) + (stars * 2)
+    Scores and RANK() are computed in SQL over the students active in the month;
+    only the requested page is loaded, with its profiles eager-loaded.
+    Pages are ordered by (rank, student id) and continue after
+    (after_rank, after_student_id); after_rank alone skips that whole rank.
     """
+    period = month_period(year, month)
+
     # Projects submitted in the given month/year
     projects_in_month = (
-        db.query(Project.student_user_id, func.count(Project.id).label("project_count"))
-        .filter(
-            extract("year", Project.submission_date) == year,
-            extract("month", Project.submission_date) == month,
+        select(
+            Project.student_user_id,
+            func.count(Project.id).label("project_count"),
+            literal(0).label("star_count"),
         )
+        .where(*period.filter(Project.submission_date))
         .group_by(Project.student_user_id)
-        .subquery()
     )
 
     # Stars received in the given month/year
     stars_in_month = (
-        db.query(
-            Project.student_user_id, func.count(ProjectStar.id).label("star_count")
+        select(
+            Project.student_user_id,
+            literal(0).label("project_count"),
+            func.count(ProjectStar.id).label("star_count"),
         )
         .join(ProjectStar, Project.id == ProjectStar.project_id)
-        .filter(
-            extract("year", ProjectStar.starred_at) == year,
-            extract("month", ProjectStar.starred_at) == month,
-        )
+        .where(*period.filter(ProjectStar.starred_at))
         .group_by(Project.student_user_id)
-        .subquery()
     )
 
-    # Combine the data
-    query = (
-        db.query(
-            User,
-            func.coalesce(projects_in_month.c.project_count, 0).label(
-                "monthly_projects"
-            ),
-            func.coalesce(stars_in_month.c.star_count, 0).label("monthly_stars"),
+    # Combine the data; only students with activity in the month are ranked
+    activity = union_all(projects_in_month, stars_in_month).subquery()
+    totals = (
+        select(
+            activity.c.student_user_id,
+            func.sum(activity.c.project_count).label("project_count"),
+            func.sum(activity.c.star_count).label("star_count"),
         )
-        .outerjoin(projects_in_month, User.id == projects_in_month.c.student_user_id)
-        .outerjoin(stars_in_month, User.id == stars_in_month.c.student_user_id)
-        .filter(User.role == "student")
-        .all()
+        .join(User, User.id == activity.c.student_user_id)
+        .where(User.role == UserRole.student)
+        .group_by(activity.c.student_user_id)
+        .subquery()
     )
-
-    # Calculate scores and rank
-    ranked_students = []
-    for user, project_count, star_count in query:
-        if project_count > 0 or star_count > 0:
-            score = (project_count * 10) + (star_count * 2)
-            ranked_students.append(
-                {
-                    "student": StudentSchema(
-                        user=user,
-                        profile=StudentProfileDetails(**user.student_profile.__dict__),
-                    ),
-                    "projects_submitted_in_month": project_count,
-                    "stars_received_in_month": star_count,
-                    "score": score,
-                }
+    score = totals.c.project_count * PROJECT_POINTS + totals.c.star_count * STAR_POINTS
+    ranked = select(
+        totals.c.student_user_id,
+        totals.c.project_count,
+        totals.c.star_count,
+        score.label("score"),
+        func.rank().over(order_by=score.desc()).label("rank"),
+    ).subquery()
+
+    page_query = select(ranked).order_by(ranked.c.rank, ranked.c.student_user_id)
+    if after_rank is not None:
+        if after_student_id is None:
+            page_query = page_query.where(ranked.c.rank > after_rank)
+        else:
+            page_query = page_query.where(
+                tuple_(ranked.c.rank, ranked.c.student_user_id)
+                > tuple_(after_rank, after_student_id)
             )
+    rows = db.execute(page_query.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Profiles for this page only
+    students = {
+        user.id: user
+        for user in db.query(User)
+        .options(joinedload(User.student_profile))
+        .filter(User.id.in_([row.student_user_id for row in rows]))
+    }
+
+    report_entries = []
+    for row in rows:
+        user = students[row.student_user_id]
+        report_entries.append(
+            TopStudentEntry(
+                rank=row.rank,
+                student=StudentSchema(
+                    user=user,
+                    profile=StudentProfileDetails(**user.student_profile.__dict__),
+                ),
+                projects_submitted_in_month=row.project_count,
+                stars_received_in_month=row.star_count,
+                score=row.score,
+            )
+        )
 
-    # Sort by score descending
-    ranked_students.sort(key=lambda x: x["score"], reverse=True)
-
-    # Add rank
-    report_entries = [
-        TopStudentEntry(rank=i + 1, **data) for i, data in enumerate(ranked_students)
-    ]
-
-    return TopStudentReport(month=month, year=year, report=report_entries)
+    return TopStudentReport(
+        month=month,
+        year=year,
+        report=report_entries,
+        next_after_rank=rows[-1].rank if has_more else None,
+        next_after_student_id=rows[-1].student_user_id if has_more else None,
+    )
@@ -1,24 +1,39 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 
 from app.models.user import User, UserRole, StudentProfile
-from app.schemas.student import StudentCreate, StudentUpdate
+from app.schemas.student import (
+    StudentCreate,
+    StudentUpdate,
+    Student as StudentSchema,
+    StudentProfileDetails,
+)
+from app.schemas.user import User as UserSchema
 from app.models.enrollment import (
     StudentEnrollment,
     EnrollmentCohort,
     LabSection,
 )  # Import enrollment models
-from app.core.security import get_password_hash
+from app.core.security import hash_passwords
+from app.core.dashboard_cache import invalidate_labs_of_user
+from app.core.user_cache import user_cache
 
 
 def bulk_create_students_in_lab(
     db: Session, students_data: List[StudentCreate], lab_id: int
-) -> List[User]:
+) -> List[StudentSchema]:
     """
     Creates multiple students in a single transaction.
-    First, it validates that none of the mobile numbers already exist.
+    First, it validates that none of the mobile numbers already exist, before
+    any password is hashed.
+    Users and profiles are written with set-based multi-row INSERTs (users with
+    RETURNING id), so the import takes a handful of statements whatever the
+    roster size. The response is built from the input, without re-reading rows.
     """
     mobile_numbers = [s.mobile_number for s in students_data]
+    if len(set(mobile_numbers)) != len(mobile_numbers):
+        raise ValueError("The roster contains duplicate mobile numbers")
     existing_users = (
         db.query(User.mobile_number)
         .filter(User.mobile_number.in_(mobile_numbers))
@@ -30,26 +45,43 @@ def bulk_create_students_in_lab(
             f"The following mobile numbers are already registered: {existing_numbers}"
         )
 
-    new_users = []
-    try:
-        for student_data in students_data:
-            hashed_password = get_password_hash(student_data.password)
-            db_user = User(
-                name=student_data.name,
-                last_name=student_data.last_name,
-                mobile_number=student_data.mobile_number,
-                email=student_data.email,
-                password_hash=hashed_password,
-                role=UserRole.student,
-                date_of_birth=student_data.date_of_birth,
-                gender=student_data.gender,
-                address=student_data.address,
-            )
-            db.add(db_user)
-            db.flush()
+    if not students_data:
+        return []
 
-            db_student_profile = StudentProfile(
-                user_id=db_user.id,
+    # Hash all passwords in parallel only once the roster is known to be valid,
+    # so a rejected roster costs no bcrypt time. The validation read's
+    # transaction is ended first, so no connection is held while bcrypt runs.
+    db.commit()
+    password_hashes = hash_passwords([s.password for s in students_data])
+
+    user_rows = [
+        {
+            "name": student_data.name,
+            "last_name": student_data.last_name,
+            "mobile_number": student_data.mobile_number,
+            "email": student_data.email,
+            "password_hash": hashed_password,
+            "role": UserRole.student,
+            "date_of_birth": student_data.date_of_birth,
+            "gender": student_data.gender,
+            "address": student_data.address,
+        }
+        for student_data, hashed_password in zip(students_data, password_hashes)
+    ]
+    try:
+        # Multi-row INSERT ... RETURNING. Ids are matched back by the unique
+        # mobile number, since RETURNING order is not guaranteed.
+        users_table = User.__table__
+        inserted = db.execute(
+            insert(users_table).returning(
+                users_table.c.id, users_table.c.mobile_number
+            ),
+            user_rows,
+        ).all()
+        id_by_mobile = {mobile_number: user_id for user_id, mobile_number in inserted}
+        user_ids = [id_by_mobile[s.mobile_number] for s in students_data]
+        profiles = [
+            StudentProfileDetails(
                 join_date_in_lab=student_data.join_date_in_lab,
                 last_year_marks=student_data.last_year_marks,
                 mother_name=student_data.mother_name,
@@ -57,18 +89,34 @@ def bulk_create_students_in_lab(
                 father_name=student_data.father_name,
                 father_contact=student_data.father_contact,
             )
-            db.add(db_student_profile)
-            new_users.append(db_user)
-
+            for student_data in students_data
+        ]
+        db.execute(
+            insert(StudentProfile.__table__),
+            [
+                {"user_id": user_id, **profile.model_dump()}
+                for user_id, profile in zip(user_ids, profiles)
+            ],
+        )
         db.commit()
     except Exception as e:
         db.rollback()
         raise e
 
-    for user in new_users:
-        db.refresh(user)
-
-    return new_users
+    return [
+        StudentSchema(
+            user=UserSchema(
+                id=user_id,
+                name=student_data.name,
+                last_name=student_data.last_name,
+                mobile_number=student_data.mobile_number,
+                email=student_data.email,
+                role=UserRole.student,
+            ),
+            profile=profile,
+        )
+        for user_id, student_data, profile in zip(user_ids, students_data, profiles)
+    ]
 
 
 # def get_students_by_lab(db: Session, lab_id: int) -> List[User]:
@@ -133,6 +181,10 @@ def update_student(
             setattr(db_user.student_profile, key, value)
 
     db.commit()
+    user_cache.invalidate(student_user_id)
+    if "name" in user_update_data or "last_name" in user_update_data:
+        # Names appear in the top students/projects of their labs' dashboards
+        invalidate_labs_of_user(db, student_user_id)
     db.refresh(db_user)
     return db_user
 
@@ -5,21 +5,30 @@ from app.models.user import User, UserRole, TeacherProfile, TeacherSkill
 from app.schemas.teacher import TeacherCreate, TeacherUpdate
 from app.services import user_service
 from app.core.security import get_password_hash
+from app.core.dashboard_cache import lab_dashboard_cache
+from app.core.user_cache import user_cache
 
 
 def create_teacher_in_lab(
-    db: Session, teacher_data: TeacherCreate, lab_id: int
+    db: Session,
+    teacher_data: TeacherCreate,
+    lab_id: int,
+    hashed_password: Optional[str] = None,
 ) -> Optional[User]:
     """
     Creates a new teacher, including their user account and profile,
     and links them to a specific lab.
+    Callers creating many teachers can pass a hash precomputed with hash_passwords.
     """
+    # Hash before touching the database so no transaction is held open during bcrypt
+    if hashed_password is None:
+        hashed_password = get_password_hash(teacher_data.password)
+
     # Check if a user with this mobile number already exists
     if user_service.get_user_by_mobile(db, mobile_number=teacher_data.mobile_number):
         return None  # Indicate that the user already exists
 
     # Create the base user account
-    hashed_password = get_password_hash(teacher_data.password)
     db_user = User(
         name=teacher_data.name,
         last_name=teacher_data.last_name,
@@ -51,6 +60,7 @@ def create_teacher_in_lab(
 
     db.commit()
     db.refresh(db_user)
+    lab_dashboard_cache.invalidate([lab_id])
     return db_user
 
 
@@ -125,5 +135,6 @@ def update_teacher(
             db.add(TeacherSkill(user_id=teacher_user_id, skill_name=skill_name))
 
     db.commit()
+    user_cache.invalidate(teacher_user_id)
     db.refresh(db_user)
     return db_user
@@ -1,17 +1,65 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
 from app.models.user import User
 from app.schemas.user import UserCreate, UserMeUpdate, UserPasswordChange, UserUpdate
 from app.core.security import get_password_hash, verify_password
+from app.core.dashboard_cache import invalidate_labs_of_user, lab_dashboard_cache
+from app.core.leaderboards import leaderboards
+from app.core.user_cache import snapshot_user, user_cache
+from app.services import project_service
 
 
 def get_user_by_mobile(db: Session, mobile_number: str) -> User | None:
-    """Fetches a user by their mobile number."""
-    return db.query(User).filter(User.mobile_number == mobile_number).first()
+    """Fetches a user by their mobile number, with the teacher profile the token claims need."""
+    return (
+        db.query(User)
+        .options(joinedload(User.teacher_profile))
+        .filter(User.mobile_number == mobile_number)
+        .first()
+    )
+
+
+def get_token_claims(user: User) -> dict:
+    """
+    Builds the JWT claims for a user.
+    Carries everything lab-scoped authorization needs, so requests avoid DB lookups.
+    """
+    snapshot = snapshot_user(user)
+    return {
+        "sub": snapshot.mobile_number,
+        "uid": snapshot.id,
+        "role": snapshot.role.value,
+        "lab_id": snapshot.lab_id,
+        "ver": snapshot.token_version,
+    }
 
 
-def create_user(db: Session, user: UserCreate) -> User:
-    """Creates a new user in the database."""
-    hashed_password = get_password_hash(user.password)
+def get_token_version(db: Session, user_id: int) -> int | None:
+    """Fetches only a user's current token version (None if the user is gone)."""
+    return db.query(User.token_version).filter(User.id == user_id).scalar()
+
+
+def revoke_tokens(db: Session, user_ids: List[int]) -> None:
+    """
+    Bumps the token version of the given users, invalidating their issued tokens.
+    The caller is responsible for committing and then invalidating the user cache.
+    """
+    if not user_ids:
+        return
+    db.query(User).filter(User.id.in_(user_ids)).update(
+        {User.token_version: User.token_version + 1}, synchronize_session=False
+    )
+
+
+def create_user(
+    db: Session, user: UserCreate, hashed_password: Optional[str] = None
+) -> User:
+    """
+    Creates a new user in the database.
+    Request handlers pass a hash precomputed with get_password_hash_async.
+    """
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = User(
         name=user.name,
         last_name=user.last_name,
@@ -33,17 +81,35 @@ def update_me(db: Session, user: User, data: UserMeUpdate) -> User:
         setattr(user, key, value)
     db.add(user)
     db.commit()
+    user_cache.invalidate(user.id)
+    if "name" in update_data or "last_name" in update_data:
+        # Names appear in the top students/projects of their labs' dashboards
+        invalidate_labs_of_user(db, user.id)
     db.refresh(user)
     return user
 
 
-def change_password(db: Session, user: User, data: UserPasswordChange) -> bool:
-    """Changes the current user's password."""
-    if not verify_password(data.current_password, user.password_hash):
-        return False
-    user.password_hash = get_password_hash(data.new_password)
+def change_password(
+    db: Session,
+    user: User,
+    data: UserPasswordChange,
+    hashed_password: Optional[str] = None,
+) -> bool:
+    """
+    Changes the current user's password.
+    Request handlers verify the current password and hash the new one with the
+    async helpers, then pass the hash in; the checks here are skipped for them.
+    """
+    if hashed_password is None:
+        if not verify_password(data.current_password, user.password_hash):
+            return False
+        hashed_password = get_password_hash(data.new_password)
+    user.password_hash = hashed_password
+    # A new password revokes every access token issued under the old one
+    user.token_version = (user.token_version or 0) + 1
     db.add(user)
     db.commit()
+    user_cache.invalidate(user.id)
     return True
 
 
@@ -52,14 +118,22 @@ def get_user_by_id(db: Session, user_id: int) -> User | None:
     return db.query(User).filter(User.id == user_id).first()
 
 
-def reset_user_password(db: Session, user: User, new_password: str) -> User:
+def reset_user_password(
+    db: Session, user: User, new_password: str, hashed_password: Optional[str] = None
+) -> User:
     """
     Forcefully resets a user's password by an admin or superior.
     This function does not check for the old password.
+    Request handlers pass a hash precomputed with get_password_hash_async.
     """
-    user.password_hash = get_password_hash(new_password)
+    if hashed_password is None:
+        hashed_password = get_password_hash(new_password)
+    user.password_hash = hashed_password
+    # A reset revokes every access token issued under the old password
+    user.token_version = (user.token_version or 0) + 1
     db.add(user)
     db.commit()
+    user_cache.invalidate(user.id)
     db.refresh(user)
     return user
 
@@ -67,10 +141,25 @@ def reset_user_password(db: Session, user: User, new_password: str) -> User:
 def update_user_by_admin(db: Session, user: User, data: UserUpdate) -> User:
     """Updates a user's details by an admin."""
     update_data = data.dict(exclude_unset=True)
+    role_changed = "role" in update_data and update_data["role"] != user.role
+    mobile_changed = (
+        "mobile_number" in update_data
+        and update_data["mobile_number"] != user.mobile_number
+    )
+    if role_changed or mobile_changed:
+        # Revokes tokens that still carry the old role or subject
+        user.token_version = (user.token_version or 0) + 1
     for key, value in update_data.items():
         setattr(user, key, value)
     db.add(user)
     db.commit()
+    user_cache.invalidate(user.id)
+    if role_changed:
+        # Only students are ranked, so the user may join or leave the boards
+        leaderboards.invalidate()
+    if role_changed or "name" in update_data or "last_name" in update_data:
+        # Their labs' dashboards show student names and count by role
+        invalidate_labs_of_user(db, user.id)
     db.refresh(user)
     return user
 
@@ -79,6 +168,12 @@ def delete_user_by_id(db: Session, user_id: int) -> User | None:
     """Deletes a user by their ID."""
     user = db.query(User).filter(User.id == user_id).first()
     if user:
+        # Keeps the star counters of the projects this user starred accurate
+        project_service.remove_stars_given_by(db, user_id=user_id)
         db.delete(user)
         db.commit()
+        user_cache.invalidate(user_id)
+        # Their projects and the stars they gave leave the leaderboards
+        leaderboards.invalidate()
+        lab_dashboard_cache.clear()
     return user
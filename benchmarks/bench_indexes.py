@@ -0,0 +1,231 @@
+"""
+Benchmark: hot access paths with and without the indexes added in
+migration 1a7b3c9d2e54, on a synthetic SQLite dataset.
+
+Usage:
+    python benchmarks/bench_indexes.py [students] [repeats]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# --- Setup to allow standalone script execution ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# --- End Setup ---
+
+from sqlalchemy import create_engine, func, select
+
+from app.db.base import Base
+from app.models.enrollment import EnrollmentCohort, LabSection, StudentEnrollment
+from app.models.lab import Lab
+from app.models.mark import Mark
+from app.models.project import Project, ProjectStar
+from app.models.school import School
+from app.models.user import TeacherProfile, User, UserRole
+
+NEW_INDEXES = {
+    "uq_student_enrollments_cohort_id_student_user_id",
+    "ix_student_enrollments_student_user_id",
+    "uq_cohort_teachers_cohort_id_teacher_user_id",
+    "ix_enrollment_cohorts_lab_id_section",
+    "ix_projects_cohort_id_submission_date",
+    "ix_projects_student_user_id",
+    "uq_project_stars_project_id_user_id",
+    "ix_project_stars_starred_at",
+    "ix_marks_enrollment_id_date_recorded",
+    "ix_teacher_profiles_lab_id",
+}
+
+LABS = 50
+COHORTS = 500
+TEACHERS = 200
+
+
+def new_indexes():
+    return [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if index.name in NEW_INDEXES
+    ]
+
+
+def populate(engine, students: int):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    projects = students * 3
+    # Distinct (project, user) pairs: a user stars a project at most once
+    stars = set()
+    while len(stars) < students * 10:
+        stars.add((rng.randint(1, projects), rng.randint(1, students)))
+    users = [
+        dict(
+            id=i,
+            name=f"s{i}",
+            last_name="x",
+            mobile_number=str(10**9 + i),
+            password_hash="x",
+            role=UserRole.student if i <= students else UserRole.teacher,
+        )
+        for i in range(1, students + TEACHERS + 1)
+    ]
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), users)
+        conn.execute(School.__table__.insert(), [dict(id=1, name="School")])
+        conn.execute(
+            Lab.__table__.insert(),
+            [dict(id=i, name=f"Lab {i}", school_id=1) for i in range(1, LABS + 1)],
+        )
+        conn.execute(
+            TeacherProfile.__table__.insert(),
+            [
+                dict(user_id=students + i, lab_id=rng.randint(1, LABS))
+                for i in range(1, TEACHERS + 1)
+            ],
+        )
+        conn.execute(
+            EnrollmentCohort.__table__.insert(),
+            [
+                dict(
+                    id=i,
+                    lab_id=rng.randint(1, LABS),
+                    academic_year=2024,
+                    section=rng.choice(list(LabSection)),
+                    standard=rng.randint(5, 10),
+                )
+                for i in range(1, COHORTS + 1)
+            ],
+        )
+        conn.execute(
+            StudentEnrollment.__table__.insert(),
+            [
+                dict(id=i, student_user_id=i, cohort_id=rng.randint(1, COHORTS))
+                for i in range(1, students + 1)
+            ],
+        )
+        conn.execute(
+            Project.__table__.insert(),
+            [
+                dict(
+                    id=i,
+                    student_user_id=rng.randint(1, students),
+                    cohort_id=rng.randint(1, COHORTS),
+                    project_name=f"Project {i}",
+                    submission_date=start + timedelta(minutes=rng.randint(0, 525600)),
+                )
+                for i in range(1, projects + 1)
+            ],
+        )
+        conn.execute(
+            ProjectStar.__table__.insert(),
+            [
+                dict(
+                    project_id=project_id,
+                    user_id=user_id,
+                    starred_at=start + timedelta(minutes=rng.randint(0, 525600)),
+                )
+                for project_id, user_id in sorted(stars)
+            ],
+        )
+        conn.execute(
+            Mark.__table__.insert(),
+            [
+                dict(
+                    enrollment_id=rng.randint(1, students),
+                    assessment_name="Test",
+                    marks_obtained=rng.randint(0, 100),
+                    total_marks=100,
+                    date_recorded=date(2024, 1, 1)
+                    + timedelta(days=rng.randint(0, 364)),
+                )
+                for _ in range(students * 5)
+            ],
+        )
+
+
+def hot_queries(students: int):
+    """The filters and joins the services run most, with random parameters."""
+    month_start = datetime(2024, random.randint(1, 11), 1)
+    month_end = month_start + timedelta(days=31)
+    cohort_id = random.randint(1, COHORTS)
+    return {
+        "cohort roster": select(StudentEnrollment.student_user_id).where(
+            StudentEnrollment.cohort_id == cohort_id
+        ),
+        "student enrollments": select(StudentEnrollment.id).where(
+            StudentEnrollment.student_user_id == random.randint(1, students)
+        ),
+        "cohort projects in month": select(func.count(Project.id)).where(
+            Project.cohort_id == cohort_id,
+            Project.submission_date >= month_start,
+            Project.submission_date < month_end,
+        ),
+        "student projects": select(Project.id).where(
+            Project.student_user_id == random.randint(1, students)
+        ),
+        "star lookup": select(ProjectStar.id).where(
+            ProjectStar.project_id == random.randint(1, students * 3),
+            ProjectStar.user_id == random.randint(1, students),
+        ),
+        "stars in month": select(func.count(ProjectStar.id)).where(
+            ProjectStar.starred_at >= month_start,
+            ProjectStar.starred_at < month_end,
+        ),
+        "enrollment marks": select(Mark.marks_obtained)
+        .where(Mark.enrollment_id == random.randint(1, students))
+        .order_by(Mark.date_recorded),
+        "lab teachers": select(TeacherProfile.user_id).where(
+            TeacherProfile.lab_id == random.randint(1, LABS)
+        ),
+        "lab cohorts by section": select(EnrollmentCohort.id).where(
+            EnrollmentCohort.lab_id == random.randint(1, LABS),
+            EnrollmentCohort.section == LabSection.grok,
+        ),
+    }
+
+
+def run(engine, students: int, repeats: int) -> dict:
+    random.seed(7)
+    timings = {}
+    with engine.connect() as conn:
+        for _ in range(repeats):
+            for name, query in hot_queries(students).items():
+                start = time.perf_counter()
+                conn.execute(query).all()
+                timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+    return {name: total / repeats * 1000 for name, total in timings.items()}
+
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for index in new_indexes():
+                index.drop(conn)
+        populate(engine, students)
+
+        before = run(engine, students, repeats)
+        with engine.begin() as conn:
+            for index in new_indexes():
+                index.create(conn)
+            conn.exec_driver_sql("ANALYZE")
+        after = run(engine, students, repeats)
+        engine.dispose()
+
+    print(f"students: {students}, repeats: {repeats} (ms per query)")
+    print(f"{'query':<26}{'before':>10}{'after':>10}{'speed-up':>10}")
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<26}{before[name]:>10.3f}{after[name]:>10.3f}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
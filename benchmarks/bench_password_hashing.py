@@ -0,0 +1,55 @@
+"""
+Benchmark: hashing a student roster sequentially vs. across the bulk hashing pool.
+
+Usage:
+    python benchmarks/bench_password_hashing.py [roster_size]
+
+Run it with different PASSWORD_HASH_PROCESSES values to see the import
+scale with the number of cores, e.g.
+
+    for n in 1 2 4 8; do PASSWORD_HASH_PROCESSES=$n python benchmarks/bench_password_hashing.py 200; done
+"""
+
+import os
+import sys
+import time
+
+# --- Setup to allow standalone script execution ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# --- End Setup ---
+
+from app.core.security import (
+    _bulk_hash_workers,
+    hash_passwords,
+    pwd_context,
+    verify_password,
+)
+
+
+def main():
+    roster_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    passwords = [f"password{i}" for i in range(roster_size)]
+
+    start = time.perf_counter()
+    for password in passwords:
+        pwd_context.hash(password)
+    sequential = time.perf_counter() - start
+
+    # Warm up the pool so process start-up is not counted.
+    hash_passwords(passwords[: _bulk_hash_workers * 2])
+    start = time.perf_counter()
+    hashes = hash_passwords(passwords)
+    parallel = time.perf_counter() - start
+
+    assert verify_password(passwords[-1], hashes[-1])
+    print(f"roster size:      {roster_size}")
+    print(f"hash processes:   {_bulk_hash_workers}")
+    print(
+        f"sequential:       {sequential:.2f}s ({roster_size / sequential:.1f} hashes/s)"
+    )
+    print(f"parallel:         {parallel:.2f}s ({roster_size / parallel:.1f} hashes/s)")
+    print(f"speed-up:         {sequential / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: monthly project/star filters written with extract() versus the
+half-open range predicates from app.core.periods, on a synthetic SQLite
+dataset with the hot-path indexes in place. Prints the query plans, which
+show a full scan for extract() and an index range search for the ranges.
+
+Usage:
+    python benchmarks/bench_period_filters.py [students] [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# --- Setup to allow standalone script execution ---
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# --- End Setup ---
+
+from sqlalchemy import create_engine, extract, func, select
+
+from app.core.periods import month_period
+from app.db.base import Base
+from app.models.project import Project, ProjectStar
+
+from bench_indexes import populate
+
+YEAR, MONTH = 2024, 6
+
+
+def queries() -> dict:
+    period = month_period(YEAR, MONTH)
+    return {
+        "projects in month": (
+            select(func.count(Project.id)).where(
+                extract("year", Project.submission_date) == YEAR,
+                extract("month", Project.submission_date) == MONTH,
+            ),
+            select(func.count(Project.id)).where(
+                *period.filter(Project.submission_date)
+            ),
+        ),
+        "stars in month": (
+            select(func.count(ProjectStar.id)).where(
+                extract("year", ProjectStar.starred_at) == YEAR,
+                extract("month", ProjectStar.starred_at) == MONTH,
+            ),
+            select(func.count(ProjectStar.id)).where(
+                *period.filter(ProjectStar.starred_at)
+            ),
+        ),
+    }
+
+
+def plan(conn, query) -> str:
+    compiled = query.compile(conn, compile_kwargs={"literal_binds": True})
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+    return "; ".join(row[-1] for row in rows)
+
+
+def timed(conn, query, repeats: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = conn.execute(query).scalar()
+    return (time.perf_counter() - start) / repeats * 1000, result
+
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        populate(engine, students)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ANALYZE")
+            print(f"students: {students}, repeats: {repeats} (ms per query)")
+            for name, (extract_query, range_query) in queries().items():
+                extract_ms, extract_count = timed(conn, extract_query, repeats)
+                range_ms, range_count = timed(conn, range_query, repeats)
+                assert extract_count == range_count, (extract_count, range_count)
+                print(f"\n{name} ({range_count} rows)")
+                print(
+                    f"  extract(): {extract_ms:8.3f} ms  plan: {plan(conn, extract_query)}"
+                )
+                print(
+                    f"  range:     {range_ms:8.3f} ms  plan: {plan(conn, range_query)}"
+                )
+                print(f"  speed-up:  {extract_ms / range_ms:.1f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
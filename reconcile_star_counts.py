@@ -0,0 +1,30 @@
+"""
+Repairs drift in the denormalized projects.star_count column by recomputing
+it from project_stars.
+
+Usage:
+    python reconcile_star_counts.py
+"""
+
+# --- Setup to allow standalone script execution ---
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__))))
+# --- End Setup ---
+
+from app.db.session import SessionLocal
+from app.services import project_service
+
+
+def main():
+    db = SessionLocal()
+    try:
+        repaired = project_service.reconcile_star_counts(db)
+    finally:
+        db.close()
+    print(f"Reconciled star counts: {repaired} project(s) repaired.")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__))))
 
 from app.db.base import Base
 from app.db.session import SessionLocal, engine
+from app.core.security import hash_passwords
 from app.services import (
     user_service,
     school_service,
@@ -139,6 +140,7 @@ def seed_data(db: Session):
 
     # 4. Create Teachers
     print(f"Creating {NUM_TEACHERS_PER_LAB * len(labs)} teachers...")
+    teacher_creation_list = []
     for lab in labs:
         for _ in range(NUM_TEACHERS_PER_LAB):
             teacher_data = teacher_schema.TeacherCreate(
@@ -149,13 +151,21 @@ def seed_data(db: Session):
                 email=fake.unique.email(),
                 skills=["Python", "Robotics", "3D Printing", "IoT"][_ % 4 :],
             )
-            teacher = teacher_service.create_teacher_in_lab(
-                db, teacher_data=teacher_data, lab_id=lab.id
-            )
-            teachers.append(teacher)
-            teachers_by_lab[lab.id].append(
-                teacher
-            )  # Add teacher to the lab's staff list
+            teacher_creation_list.append((lab, teacher_data))
+
+    # Hash all teacher passwords in parallel instead of one by one
+    teacher_hashes = hash_passwords([t.password for _, t in teacher_creation_list])
+    for (lab, teacher_data), hashed_password in zip(
+        teacher_creation_list, teacher_hashes
+    ):
+        teacher = teacher_service.create_teacher_in_lab(
+            db,
+            teacher_data=teacher_data,
+            lab_id=lab.id,
+            hashed_password=hashed_password,
+        )
+        teachers.append(teacher)
+        teachers_by_lab[lab.id].append(teacher)  # Add teacher to the lab's staff list
 
     all_staff = lab_heads + teachers
 
@@ -213,13 +223,13 @@ def seed_data(db: Session):
 
     # 8. Enroll Students in Cohorts
     print("Enrolling students into cohorts...")
+    enrollments = {}
     for student in students:
         num_enrollments = random.randint(1, 2)
         enrolled_cohorts = random.sample(cohorts, num_enrollments)
         for cohort in enrolled_cohorts:
-            enrollment_service.enroll_students_in_cohort(
-                db, cohort_id=cohort.id, student_ids=[student.id]
-            )
+            enrollments.setdefault(cohort.id, []).append(student.user.id)
+    enrollment_service.bulk_enroll_students(db, enrollments=enrollments)
 
     # 9. Create Projects
     print(f"Creating ~{NUM_PROJECTS_PER_STUDENT * len(students)} projects...")